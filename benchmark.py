@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+MOTOR Z9 ULTRA v10.2 - SUÍTE DE BENCHMARK
+================================================================================
+Históricos sintéticos (formato DEZENAS.txt) de tamanho crescente, tempo e pico
+de memória de cada etapa do motor. Sementes fixas, sem rede; o resultado vai
+para um JSON que pode ser comparado entre versões.
+
+    python benchmark.py                          # 1k, 10k, 100k e 1M concursos
+    python benchmark.py --tamanhos 1000 10000 --saida bench.json
+"""
+
+import os
+import sys
+import time
+import json
+import platform
+import argparse
+import tempfile
+import resource
+import tracemalloc
+from datetime import datetime
+from typing import List, Dict, Callable
+
+import numpy as np
+
+import motor as z9
+
+# ================================================================================
+# CONFIGURAÇÕES
+# ================================================================================
+
+TAMANHOS_PADRAO = [1_000, 10_000, 100_000, 1_000_000]
+SEMENTE_PADRAO = 20240101
+REPETICOES_PADRAO = 3
+ARQUIVO_SAIDA = 'bench_output.json'
+PASTA_HISTORICOS = os.path.join(tempfile.gettempdir(), 'z9_benchmark')
+LOTE_GERACAO = 100_000
+# Desvio do modo incremental de AcumuladorInercia: últimos N sorteios, um por vez
+DERIVA_TOLERANCIAS = [0.01, 0.05]
+DERIVA_PASSOS = 100
+DERIVA_TAMANHO_MAXIMO = 100_000  # o lado exato reancora a cada passo (O(T) por passo)
+
+# ================================================================================
+# HISTÓRICO SINTÉTICO
+# ================================================================================
+
+def gerar_historico(caminho: str, concursos: int, semente: int):
+    """Escreve `concursos` sorteios uniformes (6 de 60, sem repetição) em idx;d1;...;d6"""
+    rng = np.random.default_rng(semente)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        for ini in range(0, concursos, LOTE_GERACAO):
+            k = min(LOTE_GERACAO, concursos - ini)
+            dezenas = np.argsort(rng.random((k, 60)), axis=1)[:, :6] + 1
+            f.write(''.join(f"{ini + i + 1};" + ';'.join(f"{d:02d}" for d in linha) + '\n'
+                            for i, linha in enumerate(dezenas.tolist())))
+    os.replace(temporario, caminho)
+
+def historico_sintetico(concursos: int, semente: int) -> str:
+    """Caminho do histórico sintético (gerado uma vez e reaproveitado entre execuções)"""
+    os.makedirs(PASTA_HISTORICOS, exist_ok=True)
+    caminho = os.path.join(PASTA_HISTORICOS, f"dezenas_{concursos}_{semente}.txt")
+    if not os.path.exists(caminho):
+        gerar_historico(caminho, concursos, semente)
+    return caminho
+
+# ================================================================================
+# ETAPAS
+# ================================================================================
+
+def etapas(arquivo: str, semente: int) -> List[tuple]:
+    """(nome, função) na ordem do pipeline; cada etapa usa o estado das anteriores"""
+    estado: Dict = {}
+
+    def carregar():
+        motor = z9.MotorDados()
+        if not motor.carregar(arquivo, usar_snapshot=False):
+            raise RuntimeError(f"falha ao carregar {arquivo}")
+        motor.monte_carlo = z9.MotorMonteCarlo(motor, semente=semente)
+        estado['motor'] = motor
+
+    def processar_analytics():
+        estado['motor'].monte_carlo.rng = np.random.default_rng(semente)
+        estado['motor']._processar_analytics()
+
+    def construir_matriz():
+        estado['motor']._construir_matriz()
+
+    def analisar_inercia():
+        motor = estado['motor']
+        motor.monte_carlo.rng = np.random.default_rng(semente)
+        motor.inercias_cache = None
+        estado['inercias'] = z9.AnalisadorInercia(motor).analisar()
+        estado['classificador'] = z9.ClassificadorTermico(motor)
+        estado['precisao'] = z9.MotorPrecisao(motor, estado['classificador'])
+
+    # Orçamento fixo (limite=0 desliga a parada antecipada) para comparar versões
+    def simular_raiz():
+        mc = estado['motor'].monte_carlo
+        mc.rng = np.random.default_rng(semente)
+        mc.simular_distribuicao_raiz(0, estado['inercias'][0].raiz_dominante, limite=0.0)
+
+    def simular_jogo():
+        mc = estado['motor'].monte_carlo
+        mc.rng = np.random.default_rng(semente)
+        mc.simular_jogo_completo(estado['motor'].historico.dezenas[0].tolist(), limite=0.0)
+
+    def calcular_precisao():
+        jogos = estado['motor'].historico.dezenas[:1000].tolist()
+        for jogo in jogos:
+            estado['precisao'].calcular(jogo, estado['inercias'])
+
+    def gerar_jogos():
+        gerador = z9.GeradorJogos(estado['motor'], estado['inercias'], estado['classificador'],
+                                  estado['precisao'], semente=semente)
+        gerador.gerar(7)
+
+    return [
+        ('carregar', carregar),
+        ('_processar_analytics', processar_analytics),
+        ('_construir_matriz', construir_matriz),
+        ('AnalisadorInercia.analisar', analisar_inercia),
+        ('simular_distribuicao_raiz', simular_raiz),
+        ('simular_jogo_completo', simular_jogo),
+        ('MotorPrecisao.calcular', calcular_precisao),
+        ('GeradorJogos.gerar', gerar_jogos),
+    ]
+
+def medir(funcao: Callable, repeticoes: int) -> Dict:
+    """Tempos sem tracemalloc (que distorce o relógio) + uma execução só para o pico de memória"""
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'segundos_min': min(tempos),
+        'segundos_mediana': float(np.median(tempos)),
+        'segundos': tempos,
+        'pico_memoria_bytes': pico
+    }
+
+def executar(tamanhos: List[int], semente: int, repeticoes: int, saida=sys.stderr) -> Dict:
+    relatorio = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'semente': semente,
+        'repeticoes': repeticoes,
+        'parametros': {
+            'MC_ITERACOES_RAIZ': z9.MC_ITERACOES_RAIZ,
+            'MC_ITERACOES_JOGO': z9.MC_ITERACOES_JOGO,
+            'MC_MODO_EXATO': z9.MC_MODO_EXATO
+        },
+        'resultados': []
+    }
+    for tamanho in tamanhos:
+        arquivo = historico_sintetico(tamanho, semente)
+        print(f"[{tamanho} concursos] {arquivo}", file=saida)
+        resultado = {'concursos': tamanho, 'arquivo_bytes': os.path.getsize(arquivo), 'etapas': {}}
+        for nome, funcao in etapas(arquivo, semente):
+            medida = medir(funcao, repeticoes)
+            resultado['etapas'][nome] = medida
+            print(f"  {nome:<28} {medida['segundos_min']:>10.4f}s "
+                  f"{medida['pico_memoria_bytes'] / 2**20:>10.1f} MiB", file=saida)
+        if tamanho <= DERIVA_TAMANHO_MAXIMO:
+            motor = z9.MotorDados()
+            motor.carregar(arquivo, usar_snapshot=False, verboso=False)
+            inicio = max(1, tamanho - DERIVA_PASSOS)
+            resultado['deriva_inercia'] = [z9.AcumuladorInercia.medir_deriva(motor.historico, t, inicio)
+                                           for t in DERIVA_TOLERANCIAS]
+            for d in resultado['deriva_inercia']:
+                print(f"  deriva inércia tol={d['tolerancia']:<6} desvio {d['desvio_maximo']:.2e}  "
+                      f"trocas {d['trocas_raiz_dominante']}", file=saida)
+        relatorio['resultados'].append(resultado)
+
+    # Pico de RSS do processo inteiro (KiB no Linux)
+    relatorio['rss_maximo_kib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return relatorio
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do Motor Z9 em históricos sintéticos")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO)
+    parser.add_argument('--semente', type=int, default=SEMENTE_PADRAO)
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--saida', default=ARQUIVO_SAIDA, help="arquivo JSON ('-' = stdout)")
+    args = parser.parse_args()
+
+    relatorio = executar(args.tamanhos, args.semente, max(1, args.repeticoes))
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida == '-':
+        print(texto)
+    else:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto + '\n')
+        print(f"Resultados em {args.saida}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -17,12 +17,23 @@ import random
 import json
 import hashlib
 import itertools
+import mmap
+import multiprocessing
+import struct
+import gzip
+import lzma
+import csv
+import argparse
 from collections import Counter, defaultdict, deque
+from collections.abc import Mapping, Sequence
 from datetime import datetime
-from typing import List, Dict, Tuple, Set, Optional
-from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Set, Optional, Iterator
+from dataclasses import dataclass, field, asdict
 from enum import Enum
-from functools import lru_cache, wraps 
+from functools import lru_cache, wraps
+from contextlib import contextmanager 
+
+import numpy as np 
 
 # ================================================================================
 # CONFIGURAÇÕES MONTE CARLO
@@ -31,11 +42,37 @@ from functools import lru_cache, wraps
 CHAVE_MESTRA = "hackerstarclay"
 ARQUIVO_DADOS = 'DEZENAS.txt' 
 
+# Snapshot binário das análises (chaveado pelo hash do arquivo de dados)
+USAR_SNAPSHOT = True
+SUFIXO_SNAPSHOT = '.z9snap'
+VERSAO_SNAPSHOT = 2 
+
+# Histórico binário (colunas mapeadas em memória, sem parse)
+SUFIXO_HISTORICO = '.z9hist'
+VERSAO_HISTORICO = 1 
+
 # Parâmetros Monte Carlo - Ajustáveis para precisão máxima
-MC_ITERACOES_RAIZ = 5000      # Simulações por posição de raiz
-MC_ITERACOES_JOGO = 10000     # Simulações por jogo gerado
-MC_CONVERGENCIA_LIMITE = 0.001 # Limiar de convergência (quanto menor, mais preciso)
-MC_JANELA_TEMPORAL = 100      # Jogos para análise de atrator 
+MC_ITERACOES_RAIZ = 5000      # Simulações por posição de raiz
+MC_ITERACOES_JOGO = 10000     # Simulações por jogo gerado
+MC_CONVERGENCIA_LIMITE = 0.0025     # Erro padrão alvo da média nas raízes (escala 0-1; dp ≈ 0.11)
+MC_CONVERGENCIA_LIMITE_JOGO = 0.05   # Erro padrão alvo da média de acertos nos jogos (escala 0-6; dp ≈ 0.75)
+MC_LOTE_CONVERGENCIA = 500    # Iterações por lote entre testes de convergência (no máximo)
+MC_LOTES_MINIMOS = 4          # Tetos pequenos são divididos em pelo menos 4 lotes (o teste pode parar antes do teto)
+MC_JANELA_TEMPORAL = 100      # Jogos para análise de atrator 
+MC_MODO_EXATO = False         # Distribuição exata de acertos (sem amostragem) nos jogos 
+ATRATOR_JANELA = 100          # Sorteios na autocorrelação do atrator (None = histórico todo)
+ATRATOR_MAX_LAG = 19          # Maior período (lag) procurado pelo atrator 
+_PADRAO = object()            # Sentinela de "usar a constante global" onde None já tem significado 
+
+# Geração de candidatos: amostragem vetorizada em lotes, só os melhores vão ao Monte Carlo
+CANDIDATOS_POR_LETRA = 100_000  # Candidatos amostrados por letra
+LOTE_CANDIDATOS = 1 << 14       # Candidatos por lote vetorizado
+TOP_K_REFINAMENTO = 20          # Melhores (por precisão sem MC) refinados com Monte Carlo 
+
+# Relatório de instrumentação por scan (JSON Lines); vazio = desligado
+ENV_PERFIL = 'Z9_PERFIL'
+ENV_PERFIL_CPROFILE = 'Z9_PERFIL_CPROFILE'  # N > 0: inclui as N funções mais caras (cProfile) 
+ENV_RENDER = 'Z9_RENDER'  # 'ansi' (padrão), 'texto' (sem cores) ou 'json'
 
 # Cores para terminal
 COR_RESET = "\033[0m"
@@ -54,824 +91,2867 @@ COR_NEGRITO = "\033[1m"
 
 @dataclass
 class DezenaAnalytics:
-    valor: int
-    raiz: int
-    atraso_atual: int = 0
-    atraso_medio: float = 0.0
-    frequencia_total: int = 0
-    frequencia_recente: float = 0.0
-    ciclo_medio: float = 0.0
-    probabilidade_saida: float = 0.0
-    score_momentum: float = 0.0
-    status: str = "neutro"
-    # Monte Carlo extras
-    mc_confianca: float = 0.0
-    mc_atrator: float = 0.0 
+    valor: int
+    raiz: int
+    atraso_atual: int = 0
+    atraso_medio: float = 0.0
+    frequencia_total: int = 0
+    frequencia_recente: float = 0.0
+    ciclo_medio: float = 0.0
+    probabilidade_saida: float = 0.0
+    score_momentum: float = 0.0
+    status: str = "neutro"
+    # Monte Carlo extras
+    mc_confianca: float = 0.0
+    mc_atrator: float = 0.0 
 
 @dataclass
 class PosicaoRaiz:
-    posicao: int
-    raiz_dominante: int
-    tendencia: str
-    forca: float
-    distribuicao: Dict[int, float]
-    confianca: float
-    # Monte Carlo extras
-    mc_distribuicao: Dict[int, float] = field(default_factory=dict)
-    mc_entropia: float = 0.0
-    mc_atrator_stranho: Optional[int] = None 
+    posicao: int
+    raiz_dominante: int
+    tendencia: str
+    forca: float
+    distribuicao: Dict[int, float]
+    confianca: float
+    # Monte Carlo extras
+    mc_distribuicao: Dict[int, float] = field(default_factory=dict)
+    mc_entropia: float = 0.0
+    mc_atrator_stranho: Optional[int] = None 
 
-@dataclass
 class JogoGerado:
-    letra: str
-    dezenas: List[int]
-    raizes: List[int]
-    precisao: float
-    dna: str = ""
-    status_detalhado: List[str] = field(default_factory=list)
-    # Monte Carlo extras
-    mc_score: float = 0.0
-    mc_convergencia: float = 0.0
-    mc_variancia: float = 0.0 
-
-    def __post_init__(self):
-        if not self.dna:
-            self.dna = hashlib.md5(''.join(f"{d:02d}" for d in sorted(self.dezenas)).encode()).hexdigest()[:12] 
+    """
+    Jogo gerado. A identidade é `chave`, a máscara de 60 bits das dezenas (mesmo
+    conjunto = mesma chave); o DNA hex (MD5) só é calculado quando exibido.
+    Com __slots__, sem __dict__ por instância
+    """ 
+
+    __slots__ = ('letra', 'dezenas', 'raizes', 'precisao', 'status_detalhado',
+                 'mc_score', 'mc_convergencia', 'mc_variancia', 'chave', '_dna') 
+
+    def __init__(self, letra: str, dezenas: List[int], raizes: List[int], precisao: float,
+                 dna: str = "", status_detalhado: Optional[List[str]] = None,
+                 mc_score: float = 0.0, mc_convergencia: float = 0.0, mc_variancia: float = 0.0):
+        self.letra = letra
+        self.dezenas = dezenas
+        self.raizes = raizes
+        self.precisao = precisao
+        self.status_detalhado = status_detalhado if status_detalhado is not None else []
+        # Monte Carlo extras
+        self.mc_score = mc_score
+        self.mc_convergencia = mc_convergencia
+        self.mc_variancia = mc_variancia
+        self.chave = mascara_jogo(dezenas)
+        self._dna = dna or None 
+
+    @property
+    def dna(self) -> str:
+        if self._dna is None:
+            self._dna = hashlib.md5(''.join(f"{d:02d}" for d in sorted(self.dezenas)).encode()).hexdigest()[:12]
+        return self._dna 
+
+    def __repr__(self) -> str:
+        return (f"JogoGerado(letra={self.letra!r}, dezenas={self.dezenas!r}, "
+                f"precisao={self.precisao!r}, chave={self.chave:#x})") 
+
+    def __eq__(self, outro) -> bool:
+        if not isinstance(outro, JogoGerado):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(outro, a) for a in self.__slots__ if a != '_dna') 
+
+@dataclass
+class ResumoGeracao:
+    """Evento final de GeradorJogos.gerar_fluxo"""
+    ranking: List[JogoGerado]
+    pool_elite: List[List[int]] 
 
 # ================================================================================
 # FUNÇÕES MATEMÁTICAS
 # ================================================================================ 
 
 def calcular_raiz(n: int) -> int:
-    """Raiz digital 1-9"""
-    if n <= 0:
-        return 0
-    return (n - 1) % 9 + 1 
+    """Raiz digital 1-9"""
+    if n <= 0:
+        return 0
+    return (n - 1) % 9 + 1 
 
 def calcular_entropia(dados: List[int]) -> float:
-    """Entropia de Shannon"""
-    if not dados:
-        return 0.0
-    counter = Counter(dados)
-    total = len(dados)
-    entropia = 0.0
-    for count in counter.values():
-        p = count / total
-        if p > 0:
-            entropia -= p * math.log2(p)
-    return entropia 
+    """Entropia de Shannon"""
+    if not dados:
+        return 0.0
+    counter = Counter(dados)
+    total = len(dados)
+    entropia = 0.0
+    for count in counter.values():
+        p = count / total
+        if p > 0:
+            entropia -= p * math.log2(p)
+    return entropia 
 
 def calcular_variancia(dados: List[float]) -> float:
-    """Variância amostral"""
-    if len(dados) < 2:
-        return 0.0
-    media = sum(dados) / len(dados)
-    return sum((x - media) ** 2 for x in dados) / (len(dados) - 1) 
+    """Variância amostral"""
+    if len(dados) < 2:
+        return 0.0
+    media = sum(dados) / len(dados)
+    return sum((x - media) ** 2 for x in dados) / (len(dados) - 1) 
 
 # ================================================================================
-# MOTOR MONTE CARLO
+# INSTRUMENTAÇÃO
 # ================================================================================ 
 
-class MotorMonteCarlo:
-    """Simulação de Monte Carlo para aceleração de convergência""" 
-
-    def __init__(self, motor_dados: 'MotorDados'):
-        self.motor = motor_dados
-        self.historico_simulacoes: List[Dict] = []
-        self.atratores_detectados: Dict[int, List[int]] = {} 
-
-    def simular_distribuicao_raiz(self, posicao: int, raiz_alvo: int,
-                                  iteracoes: int = MC_ITERACOES_RAIZ) -> Dict:
-        """
-        Simula milhares de cenários para encontrar a distribuição
-        de convergência da raiz em uma posição específica
-        """
-        resultados = []
-        dados = self.motor.dados[-MC_JANELA_TEMPORAL:] 
-
-        for _ in range(iteracoes):
-            # Simula um cenário temporal aleatório
-            amostra = random.sample(dados, min(20, len(dados)))
-            raizes_amostra = [j['raizes'][posicao] for j in amostra]
-  letra: str
-    dezenas: List[int]
-    raizes: List[int]
-    precisao: float
-    dna: str = ""
-    status_detalhado: List[str] = field(default_factory=list)
-    # Monte Carlo extras
-    mc_score: float = 0.0
-    mc_convergencia: float = 0.0
-    mc_variancia: float = 0.0 
-
-    def __post_init__(self):
-        if not self.dna:
-            self.dna = hashlib.md5(''.join(f"{d:02d}" for d in sorted(self.dezenas)).encode()).hexdigest()[:12] 
+class Instrumentacao:
+    """
+    Tempos por etapa e contadores de trabalho (iterações MC, candidatos, consultas
+    à matriz de pares). Desligada, cada ponto de medição custa só um teste de flag.
+    As etapas podem se aninhar (ex.: analytics dentro de carregamento)
+    """ 
+
+    def __init__(self):
+        self.ativo = False
+        self.reiniciar() 
+
+    def reiniciar(self):
+        self.tempos: Dict[str, float] = defaultdict(float)
+        self.chamadas: Dict[str, int] = defaultdict(int)
+        self.contadores: Dict[str, int] = defaultdict(int) 
+
+    @contextmanager
+    def etapa(self, nome: str):
+        if not self.ativo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[nome] += time.perf_counter() - inicio
+            self.chamadas[nome] += 1 
+
+    def contar(self, nome: str, quantidade: int = 1):
+        if self.ativo:
+            self.contadores[nome] += quantidade 
+
+    def extrair(self) -> Dict:
+        return {'tempos': dict(self.tempos), 'chamadas': dict(self.chamadas),
+                'contadores': dict(self.contadores)} 
+
+    def combinar(self, parcial: Dict):
+        """Soma medições feitas em outro processo (trabalhadores do pool)"""
+        for destino, origem in ((self.tempos, parcial['tempos']), (self.chamadas, parcial['chamadas']),
+                                (self.contadores, parcial['contadores'])):
+            for nome, valor in origem.items():
+                destino[nome] += valor 
+
+    def relatorio(self, **extras) -> Dict:
+        etapas = {nome: {'segundos': round(self.tempos[nome], 6), 'chamadas': self.chamadas[nome]}
+                  for nome in self.tempos}
+        derivados = {}
+        if self.tempos.get('candidatos') and self.contadores.get('candidatos_gerados'):
+            derivados['candidatos_por_segundo'] = round(self.contadores['candidatos_gerados']
+                                                        / self.tempos['candidatos'], 1)
+        return {**extras, 'etapas': etapas, 'contadores': dict(self.contadores), **derivados} 
+
+def resumo_cprofile(perfilador, limite: int) -> List[Dict]:
+    """As `limite` funções com maior tempo acumulado"""
+    import pstats
+    estatisticas = pstats.Stats(perfilador).stats
+    linhas = sorted(estatisticas.items(), key=lambda item: item[1][3], reverse=True)[:limite]
+    return [{'funcao': f"{arquivo}:{linha}({nome})", 'chamadas': nc,
+             'tempo_proprio': round(tt, 6), 'tempo_acumulado': round(ct, 6)}
+            for (arquivo, linha, nome), (_, nc, tt, ct, _) in linhas] 
+
+PERFIL = Instrumentacao() 
 
 # ================================================================================
-# FUNÇÕES MATEMÁTICAS
+# HISTÓRICO COLUNAR
 # ================================================================================ 
 
-def calcular_raiz(n: int) -> int:
-    """Raiz digital 1-9"""
-    if n <= 0:
-        return 0
-    return (n - 1) % 9 + 1 
-
-def calcular_entropia(dados: List[int]) -> float:
-    """Entropia de Shannon"""
-    if not dados:
-        return 0.0
-    counter = Counter(dados)
-    total = len(dados)
-    entropia = 0.0
-    for count in counter.values():
-        p = count / total
-        if p > 0:
-            entropia -= p * math.log2(p)
-    return entropia 
-
-def calcular_variancia(dados: List[float]) -> float:
-    """Variância amostral"""
-    if len(dados) < 2:
-        return 0.0
-    media = sum(dados) / len(dados)
-    return sum((x - media) ** 2 for x in dados) / (len(dados) - 1) 
+# Tabelas indexadas pela própria dezena (índice 0 = vazio)
+TABELA_RAIZ = np.array([calcular_raiz(d) for d in range(61)], dtype=np.uint8)
+MASCARA_DEZENA = np.array([0] + [1 << (d - 1) for d in range(1, 61)], dtype=np.uint64) 
+
+# Vizinhos de mesma raiz a até ±5 (perturbação no espaço de fase), com contagem por dezena
+_vizinhos = [[x for x in range(max(1, d - 5), min(61, d + 6)) if calcular_raiz(x) == calcular_raiz(d) and x != d]
+             if d > 0 else [] for d in range(61)]
+VIZINHOS_QTD = np.array([len(v) for v in _vizinhos], dtype=np.int64)
+VIZINHOS = np.array([v + [d] * (max(1, VIZINHOS_QTD.max()) - len(v)) for d, v in enumerate(_vizinhos)],
+                    dtype=np.int64)
+del _vizinhos 
+
+if hasattr(np, 'bitwise_count'):
+    contar_bits = np.bitwise_count
+else:
+    _BITS_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8) 
+
+    def contar_bits(x: np.ndarray) -> np.ndarray:
+        """Popcount de uint64 via tabela de bytes (NumPy < 2.0)"""
+        x = np.ascontiguousarray(x, dtype=np.uint64)
+        return _BITS_BYTE[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1, dtype=np.uint8) 
+
+def mascara_jogo(dezenas) -> int:
+    """Máscara de presença de 60 bits (bit d-1 ligado para cada dezena d)"""
+    mascara = 0
+    for d in dezenas:
+        mascara |= 1 << (int(d) - 1)
+    return mascara 
+
+class HistoricoColunar:
+    """
+    Histórico em colunas NumPy: dezenas e raízes (N×6 uint8), máscara de
+    presença (uint64), soma e número do concurso. Cresce por duplicação.
+    """ 
+
+    @classmethod
+    def de_colunas(cls, concursos, dezenas, raizes, mascaras, somas) -> 'HistoricoColunar':
+        """Adota colunas prontas sem copiar (ex.: mapeadas de disco); copia só ao crescer"""
+        historico = cls.__new__(cls)
+        historico._n = len(concursos)
+        historico._concursos = concursos
+        historico._dezenas = dezenas
+        historico._raizes = raizes
+        historico._mascaras = mascaras
+        historico._somas = somas
+        return historico 
+
+    def __init__(self, capacidade: int = 1024):
+        capacidade = max(1, capacidade)
+        self._n = 0
+        self._concursos = np.zeros(capacidade, dtype=np.int64)
+        self._dezenas = np.zeros((capacidade, 6), dtype=np.uint8)
+        self._raizes = np.zeros((capacidade, 6), dtype=np.uint8)
+        self._mascaras = np.zeros(capacidade, dtype=np.uint64)
+        self._somas = np.zeros(capacidade, dtype=np.uint16) 
+
+    def __len__(self) -> int:
+        return self._n 
+
+    @property
+    def concursos(self) -> np.ndarray:
+        return self._concursos[:self._n] 
+
+    @property
+    def dezenas(self) -> np.ndarray:
+        return self._dezenas[:self._n] 
+
+    @property
+    def raizes(self) -> np.ndarray:
+        return self._raizes[:self._n] 
+
+    @property
+    def mascaras(self) -> np.ndarray:
+        return self._mascaras[:self._n] 
+
+    @property
+    def somas(self) -> np.ndarray:
+        return self._somas[:self._n] 
+
+    def _garantir_capacidade(self, extra: int):
+        necessario = self._n + extra
+        capacidade = len(self._concursos)
+        if necessario <= capacidade:
+            return
+        # Colunas adotadas vazias (de_colunas com 0 linhas) têm capacidade 0
+        capacidade = max(1, capacidade)
+        while capacidade < necessario:
+            capacidade *= 2
+        for nome in ('_concursos', '_dezenas', '_raizes', '_mascaras', '_somas'):
+            antigo = getattr(self, nome)
+            novo = np.zeros((capacidade,) + antigo.shape[1:], dtype=antigo.dtype)
+            novo[:self._n] = antigo[:self._n]
+            setattr(self, nome, novo) 
+
+    def adicionar_lote(self, concursos, dezenas):
+        """Acrescenta K sorteios (dezenas K×6 já validadas) de uma vez"""
+        dezenas = np.asarray(dezenas, dtype=np.uint8).reshape(-1, 6)
+        k = len(dezenas)
+        if k == 0:
+            return
+        self._garantir_capacidade(k)
+        ini, fim = self._n, self._n + k
+        self._concursos[ini:fim] = concursos
+        self._dezenas[ini:fim] = dezenas
+        self._raizes[ini:fim] = TABELA_RAIZ[dezenas]
+        self._mascaras[ini:fim] = np.bitwise_or.reduce(MASCARA_DEZENA[dezenas], axis=1)
+        self._somas[ini:fim] = dezenas.sum(axis=1, dtype=np.uint16)
+        self._n = fim 
+
+    def adicionar(self, concurso: int, dezenas: List[int]):
+        self.adicionar_lote([concurso], [dezenas]) 
+
+    def registro(self, idx: int) -> Dict:
+        """Sorteio idx no formato dict legado"""
+        return {
+            'concurso': int(self._concursos[idx]),
+            'reais': self._dezenas[idx].tolist(),
+            'raizes': self._raizes[idx].tolist(),
+            'soma': int(self._somas[idx])
+        } 
+
+class VisaoDados(Sequence):
+    """Visão de compatibilidade: o histórico colunar como sequência de dicts""" 
+
+    def __init__(self, historico: HistoricoColunar, indices: Optional[range] = None):
+        self._historico = historico
+        self._indices = indices if indices is not None else range(len(historico)) 
+
+    def __len__(self) -> int:
+        return len(self._indices) 
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return VisaoDados(self._historico, self._indices[item])
+        return self._historico.registro(self._indices[item]) 
+
+def contar_pares(dezenas: np.ndarray, bloco: int = 1 << 16) -> np.ndarray:
+    """
+    Coocorrência 60×60 (índice d-1) como Xᵀ·X da matriz de incidência
+    sorteio×dezena, em blocos para limitar memória; diagonal zerada
+    """
+    contagem = np.zeros((60, 60), dtype=np.int64)
+    for ini in range(0, len(dezenas), bloco):
+        parte = np.asarray(dezenas[ini:ini + bloco], dtype=np.int64)
+        incidencia = np.zeros((len(parte), 60), dtype=np.float32)
+        incidencia[np.arange(len(parte))[:, None], parte - 1] = 1
+        # Contagens por bloco < 2^24: exatas em float32
+        contagem += (incidencia.T @ incidencia).astype(np.int64)
+    np.fill_diagonal(contagem, 0)
+    return contagem 
+
+@lru_cache(maxsize=None)
+def indices_pares(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Índices (i, j), i < j, de todos os pares de um jogo com n dezenas"""
+    return np.triu_indices(n, 1) 
+
+class VisaoPares(Mapping):
+    """
+    Visão somente leitura no formato legado {(a, b): frequência}, a < b,
+    sobre a matriz densa de contagens
+    """ 
+
+    def __init__(self, contagens: np.ndarray, historico: HistoricoColunar):
+        self._contagens = contagens
+        self._historico = historico 
+
+    def __getitem__(self, par: Tuple[int, int]) -> float:
+        a, b = par
+        PERFIL.contar('consultas_pares')
+        contagem = self._contagens[a - 1, b - 1] if 1 <= a < b <= 60 else 0
+        if not contagem:
+            raise KeyError(par)
+        return int(contagem) / len(self._historico) 
+
+    def __iter__(self):
+        linhas, colunas = np.nonzero(np.triu(self._contagens, 1))
+        return zip((linhas + 1).tolist(), (colunas + 1).tolist()) 
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(np.triu(self._contagens, 1))) 
+
+class IndiceInvertido:
+    """
+    Índice invertido dezena → índices (crescentes) dos sorteios em que saiu,
+    construído numa única passada (ordenação estável) no formato CSR
+    """ 
+
+    def __init__(self, dezenas: np.ndarray):
+        plano = np.asarray(dezenas, dtype=np.uint8).ravel()
+        ordem = np.argsort(plano, kind='stable')
+        self.sorteios = ordem // 6  # Estável: crescente dentro de cada dezena
+        self.frequencias = np.bincount(plano, minlength=61).astype(np.int64)
+        self.frequencias[0] = 0
+        self.inicios = np.zeros(62, dtype=np.int64)
+        np.cumsum(self.frequencias, out=self.inicios[1:])
+        self.total = len(plano) // 6 
+
+    def ocorrencias(self, dezena: int) -> np.ndarray:
+        """Índices dos sorteios (do mais antigo ao mais recente) com a dezena"""
+        if not 1 <= dezena <= 60:
+            raise ValueError(f"Dezena inválida: {dezena}")
+        return self.sorteios[self.inicios[dezena]:self.inicios[dezena + 1]] 
+
+    def intervalos(self, dezena: int) -> np.ndarray:
+        """Distância, em sorteios, entre saídas consecutivas da dezena"""
+        return np.diff(self.ocorrencias(dezena)) 
+
+    def primeiras(self) -> np.ndarray:
+        """Primeira saída de cada dezena (índice = dezena; -1 se nunca saiu)"""
+        return self._extremos(self.inicios[:-1]) 
+
+    def ultimas(self) -> np.ndarray:
+        """Última saída de cada dezena (índice = dezena; -1 se nunca saiu)"""
+        return self._extremos(self.inicios[1:] - 1) 
+
+    def recentes(self, k: int = 5) -> List[List[int]]:
+        """Até k saídas mais recentes (1-based, da mais nova à mais antiga) por dezena"""
+        fins = self.inicios[1:].tolist()
+        inicios = np.maximum(self.inicios[1:] - k, self.inicios[:-1]).tolist()
+        return [(self.sorteios[i:f][::-1] + 1).tolist() for i, f in zip(inicios, fins)] 
+
+    def _extremos(self, posicoes: np.ndarray) -> np.ndarray:
+        valores = np.full(61, -1, dtype=np.int64)
+        presentes = self.frequencias > 0
+        valores[presentes] = self.sorteios[posicoes[presentes]]
+        return valores 
+
+class CuboFrequencias:
+    """
+    Contagens acumuladas por dezena e por (posição, raiz) em pontos de controle a
+    cada BLOCO sorteios. Qualquer janela [inicio, fim) custa duas leituras mais no
+    máximo 2·BLOCO linhas de ajuste, independente do tamanho do histórico; a
+    memória fica em N/BLOCO linhas (~15 MB para 1M de sorteios). Os intervalos
+    seguem a semântica de fatias do Python (inicio=-15 → últimos 15)
+    """ 
+
+    BLOCO = 64 
+
+    def __init__(self):
+        self._historico: Optional[HistoricoColunar] = None
+        self.total = 0
+        self._pontos_dezenas = np.zeros((1, 61), dtype=np.int64)
+        self._pontos_raizes = np.zeros((1, 6, 10), dtype=np.int64) 
+
+    def atualizar(self, historico: HistoricoColunar):
+        """Acrescenta os pontos de controle dos blocos novos (recomeça se o histórico foi trocado)"""
+        if historico is not self._historico or len(historico) < self.total:
+            self.__init__()
+            self._historico = historico
+        self.total = len(historico)
+        feitos = len(self._pontos_dezenas) - 1
+        blocos = self.total // self.BLOCO - feitos
+        if blocos <= 0:
+            return 
+
+        ini, fim = feitos * self.BLOCO, (feitos + blocos) * self.BLOCO
+        bloco_id = np.arange(fim - ini) // self.BLOCO
+        dezenas = historico.dezenas[ini:fim].astype(np.int64)
+        raizes = historico.raizes[ini:fim].astype(np.int64) 
+
+        chaves = (bloco_id[:, None] * 61 + dezenas).ravel()
+        novos = np.bincount(chaves, minlength=blocos * 61).reshape(blocos, 61).cumsum(axis=0)
+        self._pontos_dezenas = np.concatenate([self._pontos_dezenas, novos + self._pontos_dezenas[-1]]) 
+
+        chaves = (bloco_id[:, None] * 60 + np.arange(6) * 10 + raizes).ravel()
+        novos = np.bincount(chaves, minlength=blocos * 60).reshape(blocos, 6, 10).cumsum(axis=0)
+        self._pontos_raizes = np.concatenate([self._pontos_raizes, novos + self._pontos_raizes[-1]]) 
+
+    def _intervalo(self, inicio: int, fim: Optional[int]) -> Tuple[int, int]:
+        ini, fim, _ = slice(inicio, fim).indices(self.total)
+        return ini, max(ini, fim) 
+
+    def _acumular(self, inicio, fim, pontos, contar) -> np.ndarray:
+        ini, fim = self._intervalo(inicio, fim)
+        if fim - ini <= self.BLOCO:
+            return contar(ini, fim)
+        a, b = ini // self.BLOCO, fim // self.BLOCO
+        return (pontos[b] - pontos[a]
+                + contar(b * self.BLOCO, fim) - contar(a * self.BLOCO, ini)) 
+
+    def frequencias(self, inicio: int = 0, fim: Optional[int] = None) -> np.ndarray:
+        """Saídas de cada dezena (índice = dezena) nos sorteios [inicio, fim)"""
+        dezenas = self._historico.dezenas if self._historico is not None else np.zeros((0, 6), np.uint8)
+        return self._acumular(inicio, fim, self._pontos_dezenas,
+                              lambda a, b: np.bincount(dezenas[a:b].ravel(), minlength=61)) 
+
+    def frequencia(self, dezena: int, inicio: int = 0, fim: Optional[int] = None) -> int:
+        """Saídas da dezena nos sorteios [inicio, fim)"""
+        return int(self.frequencias(inicio, fim)[dezena]) 
+
+    def distribuicao_raiz(self, posicao: int, inicio: int = 0, fim: Optional[int] = None) -> np.ndarray:
+        """Contagem de cada raiz (índice = raiz) na posição (0-based) nos sorteios [inicio, fim)"""
+        raizes = self._historico.raizes if self._historico is not None else np.zeros((0, 6), np.uint8)
+        return self._acumular(inicio, fim, self._pontos_raizes[:, posicao],
+                              lambda a, b: np.bincount(raizes[a:b, posicao], minlength=10)) 
 
 # ================================================================================
 # MOTOR MONTE CARLO
 # ================================================================================ 
 
 class MotorMonteCarlo:
-    """Simulação de Monte Carlo para aceleração de convergência""" 
-
-    def __init__(self, motor_dados: 'MotorDados'):
-        self.motor = motor_dados
-        self.historico_simulacoes: List[Dict] = []
-        self.atratores_detectados: Dict[int, List[int]] = {} 
-
-    def simular_distribuicao_raiz(self, posicao: int, raiz_alvo: int,
-                                  iteracoes: int = MC_ITERACOES_RAIZ) -> Dict:
-        """
-        Simula milhares de cenários para encontrar a distribuição
-        de convergência da raiz em uma posição específica
-        """
-        resultados = []
-        dados = self.motor.dados[-MC_JANELA_TEMPORAL:] 
-
-        for _ in range(iteracoes):
-            # Simula um cenário temporal aleatório
-            amostra = random.sample(dados, min(20, len(dados)))
-            raizes_amostra = [j['raizes'][posicao] for j in amostra] 
-
-            # Calcula tendência neste cenário
-            freq_raiz = raizes_amostra.count(raiz_alvo) / len(raizes_amostra) 
-
-            # Adiciona ruído controlado (fator caos)
-            ruído = random.gauss(0, 0.1)
-            resultado = max(0, min(1, freq_raiz + ruído))
-            resultados.append(resultado) 
-
-        # Análise de convergência
-        media = sum(resultados) / len(resultados)
-        variancia = calcular_variancia(resultados) 
-
-        # Detecta atrator (ponto de estabilização)        histograma = Counter([round(r, 2) for r in resultados])
-        atrator = histograma.most_common(1)[0][0] if histograma else media 
-
-        return {
-            'media': media,
-            'variancia': variancia,
-            'desvio_padrao': math.sqrt(variancia),
-            'atrator': atrator,
-            'confianca': 1 - variancia,  # Quanto menor variância, maior confiança
-            'distribuicao': {k: v/iteracoes for k, v in histograma.items()}
-        } 
-
-    def simular_jogo_completo(self, dezenas: List[int],
-                              iteracoes: int = MC_ITERACOES_JOGO) -> Dict:
-        """
-        Simula milhares de jogos similares para calcular
-        probabilidade real de acerto baseada em atratores históricos
-        """
-        acertos_simulados = []
-        dados = self.motor.dados 
-
-        for _ in range(iteracoes):
-            # Gera um jogo "vizinho" no espaço de fase
-            jogo_simulado = self._gerar_jogo_vizinho(dezenas) 
-
-            # Verifica quantos números bateriam em sorteios históricos
-            acertos = self._simular_sorteio(jogo_simulado, dados)
-            acertos_simulados.append(acertos) 
-
-        # Estatísticas de convergência
-        media_acertos = sum(acertos_simulados) / len(acertos_simulados)
-        variancia = calcular_variancia(acertos_simulados) 
-
-        # Score Monte Carlo (quanto mais estável, melhor)
-        estabilidade = 1 / (1 + variancia)
-        score_mc = media_acertos * estabilidade * 100 
-
-        return {
-            'media_acertos': media_acertos,
-            'variancia': variancia,
-            'score_mc': min(score_mc, 100),
-            'confianca': estabilidade,
-            'percentil_95': sorted(acertos_simulados)[int(iteracoes * 0.95)]
-        } 
-
-    def _gerar_jogo_vizinho(self, dezenas_base: List[int],
-                           perturbacao: float = 0.3) -> List[int]:
-        """Gera jogo próximo no espaço de fase (perturbação controlada)"""
-        jogo = []
-        for d in dezenas_base:
-            if random.random() < perturbacao:
-                # Perturba para número próximo com mesma raiz
-                raiz = calcular_raiz(d)
-                vizinhos = [x for x in range(max(1, d-5), min(61, d+6))
-                           if calcular_raiz(x) == raiz and x != d]
-                jogo.append(random.choice(vizinhos) if vizinhos else d)
-            else:
-                jogo.append(d)
-        return sorted(jogo) 
-
-    def _simular_sorteio(self, jogo: List[int], dados: List[Dict]) -> int:
-        """Simula um sorteio e retorna número de acertos"""
-        # Escolhe um sorteio histórico aleatório como "resultado"
-        sorteio_real = random.choice(dados)['reais']
-        return len(set(jogo) & set(sorteio_real)) 
-
-    def detectar_atrator_estranho(self, posicao: int) -> Optional[int]:
-        """
-        Detecta o "atrator estranho" - padrão cíclico oculto
-        que se repere apesar do caos aparente
-        """
-        if len(self.motor.dados) < 50:
-            return None 
-
-        # Análise de Fourier simplificada para detectar ciclos
-        raizes = [j['raizes'][posicao] for j in self.motor.dados[-100:]] 
-
-        # Autocorrelação
-        def autocorr(lags):
-            n = len(raizes)
-            return sum(raizes[i] * raizes[i+lags] for i in range(n-lags)) / (n-lags) 
-
-        # Procura período dominante
-        correlações = [(lag, autocorr(lag)) for lag in range(1, 20)]
-     melhor_lag = max(correlações, key=lambda x: x[1]) 
-
-        if melhor_lag[1] > 0.3:  # Correlação significativa
-            return melhor_lag[0] 
-
-        return None 
+    """Simulação de Monte Carlo para aceleração de convergência""" 
+
+    def __init__(self, motor_dados: 'MotorDados', semente: Optional[int] = None,
+                 exato: Optional[bool] = None):
+        self.motor = motor_dados
+        self.rng = np.random.default_rng(semente)
+        self.exato = MC_MODO_EXATO if exato is None else exato
+        self._cache_exato: Dict[int, Dict] = {}
+        self._cache_exato_total = -1
+        self.historico_simulacoes: List[Dict] = []
+        self.atratores_detectados: Dict[int, List[int]] = {}
+        self._periodos_cache: Dict[Tuple, List[Optional[int]]] = {} 
+
+    @staticmethod
+    def _convergiu(n: int, variancia: float, limite: float) -> bool:
+        """Erro padrão da média abaixo do limite (limite <= 0 desliga a parada antecipada)"""
+        return limite > 0 and n > 1 and math.sqrt(variancia / n) < limite 
+
+    @staticmethod
+    def _tamanho_lote(iteracoes: int) -> int:
+        """Iterações entre testes: até MC_LOTE_CONVERGENCIA, com ao menos MC_LOTES_MINIMOS lotes por teto"""
+        return max(1, min(MC_LOTE_CONVERGENCIA, -(-iteracoes // MC_LOTES_MINIMOS))) 
+
+    def simular_distribuicao_raiz(self, posicao: int, raiz_alvo: int,
+                                  iteracoes: Optional[int] = None,
+                                  limite: Optional[float] = None) -> Dict:
+        """
+        Simula milhares de cenários para encontrar a distribuição
+        de convergência da raiz em uma posição específica.
+        Roda em lotes e para quando o erro padrão da média fica abaixo
+        de `limite` (padrão MC_CONVERGENCIA_LIMITE); `iteracoes` é o teto
+        (padrão MC_ITERACOES_RAIZ)
+        """
+        iteracoes = MC_ITERACOES_RAIZ if iteracoes is None else iteracoes
+        limite = MC_CONVERGENCIA_LIMITE if limite is None else limite
+        lote = self._tamanho_lote(iteracoes)
+        janela = min(MC_JANELA_TEMPORAL, len(self.motor.historico))
+        tamanho = min(20, janela)
+        if janela == 0:
+            # Histórico vazio: nada a simular
+            return {'media': 0.0, 'variancia': 0.0, 'desvio_padrao': 0.0, 'atrator': 0.0,
+                    'confianca': 1.0, 'distribuicao': {}, 'iteracoes': 0}
+        alvos = int(self.motor.cubo.distribuicao_raiz(posicao, -janela)[raiz_alvo]) 
+
+        n, media, m2 = 0, 0.0, 0.0
+        histograma = np.zeros(101, dtype=np.int64)
+        while n < iteracoes:
+            k = min(lote, iteracoes - n) 
+
+            # Cenários do lote: quantas das `tamanho` raízes sorteadas sem
+            # reposição na janela batem com o alvo (hipergeométrica exata)
+            contagens = self.rng.hypergeometric(alvos, janela - alvos, tamanho, size=k) 
+
+            # Tendência + ruído controlado (fator caos), limitada a [0, 1]
+            resultados = np.clip(contagens / tamanho + self.rng.normal(0, 0.1, k), 0, 1) 
+
+            # Combina média e soma de quadrados do lote com o acumulado (Chan et al.)
+            media_lote = float(resultados.mean())
+            m2_lote = float(((resultados - media_lote) ** 2).sum())
+            delta = media_lote - media
+            media += delta * k / (n + k)
+            m2 += m2_lote + delta ** 2 * n * k / (n + k)
+            n += k
+            histograma += np.bincount(np.rint(resultados * 100).astype(np.int64), minlength=101) 
+
+            if self._convergiu(n, m2 / (n - 1) if n > 1 else 0.0, limite):
+                break 
+
+        # Análise de convergência
+        variancia = m2 / (n - 1) if n > 1 else 0.0
+        PERFIL.contar('mc_iteracoes_raiz', n) 
+
+        # Detecta atrator (ponto de estabilização) no histograma em centésimos
+        valores = np.flatnonzero(histograma)
+        atrator = valores[np.argmax(histograma[valores])] / 100 if len(valores) else media 
+
+        return {
+            'media': media,
+            'variancia': variancia,
+            'desvio_padrao': math.sqrt(variancia),
+            'atrator': float(atrator),
+            'confianca': 1 - variancia,  # Quanto menor variância, maior confiança
+            'distribuicao': {v / 100: c / n
+                             for v, c in zip(valores.tolist(), histograma[valores].tolist())},
+            'iteracoes': n
+        } 
+
+    def simular_jogo_completo(self, dezenas: List[int],
+                              iteracoes: Optional[int] = None,
+                              limite: Optional[float] = None) -> Dict:
+        """
+        Simula milhares de jogos similares para calcular
+        probabilidade real de acerto baseada em atratores históricos.
+        Para em lotes como simular_distribuicao_raiz (limite padrão
+        MC_CONVERGENCIA_LIMITE_JOGO); no modo exato `iteracoes` é ignorado
+        (e reportado como 0)
+        """
+        iteracoes = MC_ITERACOES_JOGO if iteracoes is None else iteracoes
+        limite = MC_CONVERGENCIA_LIMITE_JOGO if limite is None else limite
+        lote = self._tamanho_lote(iteracoes)
+        if self.exato:
+            return self._simular_jogo_exato(dezenas)
+        if iteracoes <= 0:
+            # Orçamento vazio: nada a simular (como simular_lote)
+            return {'media_acertos': 0.0, 'variancia': 0.0, 'score_mc': 0.0, 'confianca': 1.0,
+                    'percentil_95': 0, 'iteracoes': 0} 
+
+        # Histograma de acertos (0 a 6) acumulado lote a lote
+        histograma = np.zeros(7, dtype=np.int64)
+        niveis = np.arange(7)
+        n = 0
+        while n < iteracoes:
+            k = min(lote, iteracoes - n) 
+
+            # Gera os jogos "vizinhos" no espaço de fase como máscaras de 60 bits
+            jogos_simulados = self._gerar_mascaras_vizinhas(dezenas, k) 
+
+            # Verifica quantos números bateriam em sorteios históricos (AND + popcount)
+            histograma += np.bincount(self._simular_sorteios(jogos_simulados), minlength=7)
+            n += k 
+
+            media_acertos = float(histograma @ niveis) / n
+            variancia = float(histograma @ (niveis - media_acertos) ** 2) / (n - 1) if n > 1 else 0.0
+            if self._convergiu(n, variancia, limite):
+                break 
+
+        PERFIL.contar('mc_iteracoes_jogo', n) 
+
+        # Score Monte Carlo (quanto mais estável, melhor)
+        estabilidade = 1 / (1 + variancia)
+        score_mc = media_acertos * estabilidade * 100 
+
+        # Percentil 95 pelo acumulado do histograma de acertos
+        percentil_95 = int(np.searchsorted(np.cumsum(histograma), int(n * 0.95), side='right')) 
+
+        return {
+            'media_acertos': media_acertos,
+            'variancia': variancia,
+            'score_mc': min(score_mc, 100),
+            'confianca': estabilidade,
+            'percentil_95': percentil_95,
+            'iteracoes': n
+        } 
+
+    def _simular_jogo_exato(self, dezenas: List[int]) -> Dict:
+        """Mesmo resultado de simular_jogo_completo no limite de infinitas iterações"""
+        total = len(self.motor.historico)
+        if total != self._cache_exato_total:
+            self._cache_exato = {}
+            self._cache_exato_total = total 
+
+        chave = mascara_jogo(dezenas)
+        if chave in self._cache_exato:
+            return dict(self._cache_exato[chave]) 
+
+        dist = self.distribuicao_acertos_exata(dezenas)
+        acertos = np.arange(len(dist))
+        media_acertos = float(dist @ acertos)
+        variancia = float(dist @ (acertos - media_acertos) ** 2) 
+
+        estabilidade = 1 / (1 + variancia)
+        score_mc = media_acertos * estabilidade * 100 
+
+        resultado = {
+            'media_acertos': media_acertos,
+            'variancia': variancia,
+            'score_mc': min(score_mc, 100),
+            'confianca': estabilidade,
+            'percentil_95': int(np.searchsorted(np.cumsum(dist), 0.95, side='right')),
+            'iteracoes': 0
+        }
+        self._cache_exato[chave] = resultado
+        return dict(resultado) 
+
+    def distribuicao_acertos_exata(self, dezenas: List[int], perturbacao: float = 0.3) -> np.ndarray:
+        """
+        P(acertos = h), h = 0..6, enumerando todos os jogos vizinhos possíveis
+        com suas probabilidades contra um sorteio uniforme do histórico
+        """
+        # Cada bola fica (1 - p) ou vai para um vizinho de mesma raiz (p / qtd)
+        opcoes = []
+        for d in dezenas:
+            qtd = int(VIZINHOS_QTD[d])
+            if qtd:
+                opcoes.append([(d, 1 - perturbacao)] +
+                              [(v, perturbacao / qtd) for v in VIZINHOS[d, :qtd].tolist()])
+            else:
+                opcoes.append([(d, 1.0)]) 
+
+        # Jogos vizinhos distintos (bolas repetidas colapsam na mesma máscara)
+        vizinhos = defaultdict(float)
+        for combinacao in itertools.product(*opcoes):
+            prob = math.prod(p for _, p in combinacao)
+            vizinhos[mascara_jogo(v for v, _ in combinacao)] += prob 
+
+        mascaras = self.motor.historico.mascaras
+        dist = np.zeros(7)
+        for mascara, prob in vizinhos.items():
+            dist += prob * np.bincount(contar_bits(mascaras & np.uint64(mascara)), minlength=7)
+        return dist / len(mascaras) 
+
+    def simular_lote(self, matriz_jogos, iteracoes: Optional[int] = None,
+                     limite: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        simular_jogo_completo para K jogos (matriz K×6) de uma vez: arrays de
+        media_acertos, variancia, score_mc, confianca e iteracoes (sem percentil).
+        Cada jogo para no seu próprio lote quando converge; os demais seguem
+        """
+        iteracoes = MC_ITERACOES_JOGO if iteracoes is None else iteracoes
+        limite = MC_CONVERGENCIA_LIMITE_JOGO if limite is None else limite
+        jogos = np.asarray(matriz_jogos, dtype=np.int64).reshape(-1, 6)
+        if self.exato:
+            media, variancia = self._momentos_exatos_lote(jogos)
+            n = np.zeros(len(jogos), dtype=np.int64)
+        else:
+            # Histograma de acertos (0 a 6) por jogo, acumulado lote a lote
+            lote = self._tamanho_lote(iteracoes)
+            niveis = np.arange(7)
+            histogramas = np.zeros((len(jogos), 7), dtype=np.int64)
+            n = np.zeros(len(jogos), dtype=np.int64)
+            ativos = np.arange(len(jogos))
+            # Blocos de jogos para limitar a matriz jogos × iterações em memória
+            passo = max(1, (1 << 22) // lote)
+            while len(ativos) and iteracoes > 0:
+                k = int(min(lote, iteracoes - n[ativos[0]]))  # ativos têm o mesmo n
+                for ini in range(0, len(ativos), passo):
+                    idx = ativos[ini:ini + passo]
+                    acertos = self._simular_sorteios(self._gerar_mascaras_vizinhas_lote(jogos[idx], k))
+                    linhas = np.arange(len(idx))[:, None] * 7
+                    histogramas[idx] += np.bincount((acertos + linhas).ravel(),
+                                                    minlength=7 * len(idx)).reshape(-1, 7)
+                n[ativos] += k 
+
+                h, m = histogramas[ativos], n[ativos]
+                media_ativos = h @ niveis / m
+                var_ativos = (h @ niveis ** 2 - m * media_ativos ** 2) / np.maximum(m - 1, 1)
+                convergiu = (limite > 0) & (m > 1) & (np.sqrt(np.maximum(var_ativos, 0) / m) < limite)
+                ativos = ativos[~convergiu & (m < iteracoes)] 
+
+            validos = np.maximum(n, 1)
+            media = histogramas @ niveis / validos
+            variancia = np.where(n > 1, np.maximum(histogramas @ niveis ** 2 - n * media ** 2, 0)
+                                 / np.maximum(n - 1, 1), 0.0)
+            PERFIL.contar('mc_iteracoes_jogo', int(n.sum())) 
+
+        estabilidade = 1 / (1 + variancia)
+        return {
+            'media_acertos': media,
+            'variancia': variancia,
+            'score_mc': np.minimum(media * estabilidade * 100, 100),
+            'confianca': estabilidade,
+            'iteracoes': n
+        } 
+
+    def _momentos_exatos_lote(self, jogos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Média e variância exatas dos acertos de K jogos contra um sorteio uniforme do histórico"""
+        media = np.empty(len(jogos))
+        variancia = np.empty(len(jogos)) 
+
+        # Sem vizinhos o jogo é fixo e os momentos saem em forma fechada:
+        # E[h] = Σ f_d,  E[h²] = Σ f_d + 2 Σ f_ab  (f = frequência por concurso).
+        # Bolas repetidas pesam 1/m (m = repetições); pares iguais já valem 0 na matriz
+        fechado = (VIZINHOS_QTD[jogos] == 0).all(axis=1)
+        total = len(self.motor.historico)
+        fixos = jogos[fechado]
+        pesos = 1 / (fixos[:, :, None] == fixos[:, None, :]).sum(axis=2)
+        i, j = indices_pares(jogos.shape[1])
+        media_fixos = (self.motor.frequencias_dezenas()[fixos] * pesos).sum(axis=1) / total
+        pares_fixos = (self.motor.contagem_pares[fixos[:, i] - 1, fixos[:, j] - 1]
+                       * pesos[:, i] * pesos[:, j]).sum(axis=1) / total
+        media[fechado] = media_fixos
+        variancia[fechado] = media_fixos + 2 * pares_fixos - media_fixos ** 2 
+
+        # Demais jogos: enumeração exata, um a um
+        for k in np.flatnonzero(~fechado).tolist():
+            resultado = self._simular_jogo_exato(jogos[k].tolist())
+            media[k] = resultado['media_acertos']
+            variancia[k] = resultado['variancia']
+        return media, variancia 
+
+    def _gerar_mascaras_vizinhas(self, dezenas_base: List[int], quantidade: int,
+                                 perturbacao: float = 0.3) -> np.ndarray:
+        """Versão em lote de _gerar_jogo_vizinho: `quantidade` jogos como máscaras uint64"""
+        base = np.asarray(dezenas_base, dtype=np.int64)[None, :]
+        return self._gerar_mascaras_vizinhas_lote(base, quantidade, perturbacao)[0] 
+
+    def _gerar_mascaras_vizinhas_lote(self, bases: np.ndarray, quantidade: int,
+                                      perturbacao: float = 0.3) -> np.ndarray:
+        """`quantidade` jogos vizinhos para cada uma das K bases: máscaras K×quantidade"""
+        bases = np.asarray(bases, dtype=np.int64)
+        qtd = VIZINHOS_QTD[bases]
+        if not qtd.any():
+            # Nenhuma bola tem vizinho de mesma raiz: os jogos nunca mudam
+            fixas = np.bitwise_or.reduce(MASCARA_DEZENA[bases], axis=1)
+            return np.repeat(fixas[:, None], quantidade, axis=1) 
+
+        forma = (len(bases), quantidade, bases.shape[1])
+        perturba = (self.rng.random(forma) < perturbacao) & (qtd[:, None, :] > 0)
+        escolha = (self.rng.random(forma) * qtd[:, None, :]).astype(np.int64)
+        jogos = np.where(perturba, VIZINHOS[bases[:, None, :], escolha], bases[:, None, :])
+        return np.bitwise_or.reduce(MASCARA_DEZENA[jogos], axis=2) 
+
+    def _simular_sorteios(self, mascaras_jogos: np.ndarray) -> np.ndarray:
+        """Confronta cada jogo com um sorteio histórico aleatório e retorna os acertos"""
+        mascaras = self.motor.historico.mascaras
+        sorteios = mascaras[self.rng.integers(0, len(mascaras), mascaras_jogos.shape)]
+        return contar_bits(mascaras_jogos & sorteios).astype(np.int64) 
+
+    def _gerar_jogo_vizinho(self, dezenas_base: List[int],
+                           perturbacao: float = 0.3) -> List[int]:
+        """Gera jogo próximo no espaço de fase (perturbação controlada)"""
+        jogo = []
+        for d in dezenas_base:
+            if random.random() < perturbacao:
+                # Perturba para número próximo com mesma raiz
+                vizinhos = VIZINHOS[d, :VIZINHOS_QTD[d]].tolist()
+                jogo.append(random.choice(vizinhos) if vizinhos else d)
+            else:
+                jogo.append(d)
+        return sorted(jogo) 
+
+    def _simular_sorteio(self, jogo: List[int]) -> int:
+        """Simula um sorteio e retorna número de acertos"""
+        # Escolhe um sorteio histórico aleatório como "resultado"
+        mascara = np.array([mascara_jogo(jogo)], dtype=np.uint64)
+        return int(self._simular_sorteios(mascara)[0]) 
+
+    def detectar_atrator_estranho(self, posicao: int) -> Optional[int]:
+        """
+        Detecta o "atrator estranho" - padrão cíclico oculto
+        que se repere apesar do caos aparente
+        """
+        return self.detectar_periodos()[posicao] 
+
+    def detectar_periodos(self, janela=_PADRAO, max_lag: Optional[int] = None) -> List[Optional[int]]:
+        """
+        Período dominante das 6 posições de uma vez: autocorrelação completa das
+        séries de raízes via FFT (janela=None usa o histórico inteiro; janela
+        <= 0 é inválida). Sem argumentos usa ATRATOR_JANELA e ATRATOR_MAX_LAG
+        lidos na chamada
+        """
+        janela = ATRATOR_JANELA if janela is _PADRAO else janela
+        if janela is not None and janela <= 0:
+            # raizes[-0:] seria o histórico inteiro em silêncio; None é o sentinela para isso
+            raise ValueError(f"janela do atrator deve ser >= 1 ou None (recebido {janela})")
+        max_lag = ATRATOR_MAX_LAG if max_lag is None else max_lag
+        chave = (self.motor.versao, len(self.motor.historico), janela, max_lag)
+        if chave in self._periodos_cache:
+            return self._periodos_cache[chave] 
+
+        if len(self.motor.historico) < 50:
+            return [None] * 6 
+
+        raizes = self.motor.historico.raizes
+        serie = (raizes if janela is None else raizes[-janela:]).astype(np.float64)
+        n = len(serie)
+        max_lag = min(max_lag, n - 1) 
+
+        # Autocorrelação (Wiener-Khinchin) com zero-padding para evitar a circular;
+        # as somas são inteiras, então o arredondamento recupera o valor exato
+        nfft = 1 << (2 * n - 1).bit_length()
+        espectro = np.fft.rfft(serie, nfft, axis=0)
+        somas = np.rint(np.fft.irfft(espectro * np.conj(espectro), nfft, axis=0)[1:max_lag + 1])
+        correlacoes = somas / (n - np.arange(1, max_lag + 1))[:, None] 
+
+        # Procura período dominante (primeiro máximo, como antes)
+        periodos = []
+        for pos in range(raizes.shape[1]):
+            melhor = int(np.argmax(correlacoes[:, pos])) if max_lag > 0 else -1
+            # Correlação significativa
+            periodos.append(melhor + 1 if melhor >= 0 and correlacoes[melhor, pos] > 0.3 else None) 
+
+        self._periodos_cache = {chave: periodos}
+        return periodos 
+
+# ================================================================================
+# LEITURA DE ARQUIVOS DE CONCURSOS
+# ================================================================================ 
+
+_NUMEROS = re.compile(r'\d+') 
+
+def abrir_dados(caminho: str):
+    """Abre em binário, descomprimindo gzip/xz de forma transparente (pela assinatura)"""
+    with open(caminho, 'rb') as f:
+        assinatura = f.read(6)
+    if assinatura.startswith(b'\x1f\x8b'):
+        return gzip.open(caminho, 'rb')
+    if assinatura == b'\xfd7zXZ\x00':
+        return lzma.open(caminho, 'rb')
+    return open(caminho, 'rb') 
+
+def _analisar_bloco_rapido(bloco: bytes) -> Optional[np.ndarray]:
+    """
+    Caminho rápido para linhas `idx;d1;...;d6` (só dígitos e separadores): as
+    dezenas (K×6) saem de passadas vetorizadas sobre os bytes; o idx só é validado,
+    pois o concurso é o número da linha. None = formato diferente
+    """
+    b = np.frombuffer(bloco, dtype=np.uint8)
+    separador = (b == 59) | (b == 10)  # ';' e '\n'
+    digito = (b >= 48) & (b <= 57)
+    if not len(b) or not (separador | digito).all():
+        return None
+    fins = np.flatnonzero(separador)
+    if len(fins) % 7 or fins[-1] != len(b) - 1:
+        return None
+    tipos = b[fins].reshape(-1, 7)
+    if not ((tipos[:, :6] == 59).all() and (tipos[:, 6] == 10).all()):
+        return None
+    tamanhos = np.diff(fins, prepend=-1) - 1
+    if tamanhos.min() < 1:
+        return None
+    fins = fins.reshape(-1, 7)[:, 1:].ravel()
+    tamanhos = tamanhos.reshape(-1, 7)[:, 1:].ravel()
+    if tamanhos.max() > 18:
+        return None 
+
+    # Dígito a dígito a partir das unidades; a k-ésima casa só nos números com mais de k dígitos
+    valores = b[fins - 1].astype(np.int64) - 48
+    for k in range(1, int(tamanhos.max())):
+        sel = np.flatnonzero(tamanhos > k)
+        valores[sel] += (b[fins[sel] - 1 - k].astype(np.int64) - 48) * 10 ** k
+    return valores.reshape(-1, 6) 
+
+class LeitorConcursos:
+    """
+    Leitura em fluxo de arquivos de concursos (texto, .gz ou .xz) em blocos de
+    bytes. Mesma regra de sempre: as 6 últimas dezenas da linha, todas em 1-60 e
+    distintas; o concurso é o número da linha. Linhas não vazias recusadas ficam
+    em `rejeitadas` como (linha, motivo), até `limite_rejeitadas` registros
+    """ 
+
+    def __init__(self, caminho: str, tamanho_bloco: int = 1 << 20, limite_rejeitadas: int = 1000):
+        self.caminho = caminho
+        self.tamanho_bloco = tamanho_bloco
+        self.limite_rejeitadas = limite_rejeitadas
+        self.rejeitadas: List[Tuple[int, str]] = []
+        self.total_rejeitadas = 0
+        self.aceitas = 0
+        self.linhas = 0 
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Blocos (concursos, dezenas K×6 uint8) já validados, em ordem"""
+        self.rejeitadas, self.total_rejeitadas, self.aceitas, self.linhas = [], 0, 0, 0
+        resto = b''
+        with abrir_dados(self.caminho) as f:
+            while True:
+                dados = f.read(self.tamanho_bloco)
+                if not dados:
+                    break
+                dados = resto + dados
+                corte = dados.rfind(b'\n') + 1
+                resto = dados[corte:]
+                if corte:
+                    yield from self._processar(dados[:corte])
+            if resto:
+                yield from self._processar(resto + b'\n') 
+
+    def _rejeitar(self, linha: int, motivo: str):
+        self.total_rejeitadas += 1
+        if len(self.rejeitadas) < self.limite_rejeitadas:
+            self.rejeitadas.append((linha, motivo)) 
+
+    def _processar(self, bloco: bytes) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        primeira = self.linhas + 1
+        if b'\r' in bloco:
+            bloco = bloco.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        self.linhas += bloco.count(b'\n') 
+
+        # Linhas em branco no fim (ex.: newline extra no final do arquivo) não mudam a numeração
+        dezenas = _analisar_bloco_rapido(bloco.rstrip(b'\n') + b'\n')
+        if dezenas is not None:
+            concursos = np.arange(primeira, primeira + len(dezenas), dtype=np.int64)
+            validas = ((dezenas >= 1) & (dezenas <= 60)).all(axis=1)
+            distintas = (np.diff(np.sort(dezenas, axis=1), axis=1) != 0).all(axis=1)
+            for idx in np.flatnonzero(~(validas & distintas)).tolist():
+                self._rejeitar(int(concursos[idx]), "dezena fora de 1-60" if not validas[idx]
+                               else "dezenas repetidas")
+            ok = validas & distintas
+            self.aceitas += int(np.count_nonzero(ok))
+            yield concursos[ok], dezenas[ok].astype(np.uint8)
+            return 
+
+        # Caminho geral: qualquer separador, as 6 últimas dezenas de cada linha
+        concursos, sorteios = [], []
+        for num_linha, linha in enumerate(bloco.decode('utf-8').split('\n')[:-1], primeira):
+            numeros = _NUMEROS.findall(linha)
+            if len(numeros) < 6:
+                if linha.strip():
+                    self._rejeitar(num_linha, "menos de 6 números")
+                continue
+            dezenas = [int(x) for x in numeros[-6:]]
+            if not all(1 <= d <= 60 for d in dezenas):
+                self._rejeitar(num_linha, "dezena fora de 1-60")
+            elif len(set(dezenas)) != 6:
+                self._rejeitar(num_linha, "dezenas repetidas")
+            else:
+                concursos.append(num_linha)
+                sorteios.append(dezenas)
+        self.aceitas += len(concursos)
+        yield (np.array(concursos, dtype=np.int64),
+               np.array(sorteios, dtype=np.uint8).reshape(-1, 6)) 
+
+# ================================================================================
+# PERSISTÊNCIA BINÁRIA (MMAP)
+# ================================================================================ 
+
+MAGIA_SNAPSHOT = b'Z9SNAP\0\0'
+ALINHAMENTO_BINARIO = 64
+_FORMATO_PREAMBULO = '<8sII'  # magia, versão, tamanho do cabeçalho JSON 
+
+def _alinhar(n: int) -> int:
+    return -(-n // ALINHAMENTO_BINARIO) * ALINHAMENTO_BINARIO 
+
+def gravar_conteiner(caminho: str, magia: bytes, versao: int,
+                     meta: Dict, arrays: Dict[str, np.ndarray]):
+    """
+    Grava arrays + cabeçalho JSON num arquivo binário com blocos alinhados,
+    pronto para abrir_conteiner mapear sem cópia. A escrita é atômica.
+    """
+    arrays = {nome: np.ascontiguousarray(arr) for nome, arr in arrays.items()}
+    descritores = {}
+    offset = 0
+    for nome, arr in arrays.items():
+        descritores[nome] = {'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': offset}
+        offset += _alinhar(arr.nbytes) 
+
+    cabecalho = json.dumps(dict(meta, arrays=descritores)).encode('utf-8')
+    preambulo = struct.pack(_FORMATO_PREAMBULO, magia, versao, len(cabecalho))
+    inicio = _alinhar(len(preambulo) + len(cabecalho)) 
+
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as f:
+        f.write(preambulo + cabecalho)
+        f.write(b'\0' * (inicio - len(preambulo) - len(cabecalho)))
+        for arr in arrays.values():
+            f.write(arr.tobytes())
+            f.write(b'\0' * (_alinhar(arr.nbytes) - arr.nbytes))
+    os.replace(temporario, caminho) 
+
+def abrir_conteiner(caminho: str, magia: bytes, versao: int) -> Optional[Tuple[Dict, Dict[str, np.ndarray]]]:
+    """Mapeia o arquivo em memória; None se a magia ou a versão não baterem"""
+    with open(caminho, 'rb') as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) 
+
+    tamanho_preambulo = struct.calcsize(_FORMATO_PREAMBULO)
+    magia_lida, versao_lida, tamanho = struct.unpack_from(_FORMATO_PREAMBULO, mapa, 0)
+    if magia_lida != magia or versao_lida != versao:
+        mapa.close()
+        return None 
+
+    meta = json.loads(mapa[tamanho_preambulo:tamanho_preambulo + tamanho].decode('utf-8'))
+    inicio = _alinhar(tamanho_preambulo + tamanho)
+    arrays = {}
+    for nome, desc in meta.pop('arrays').items():
+        arrays[nome] = np.frombuffer(mapa, dtype=np.dtype(desc['dtype']), count=math.prod(desc['shape']),
+                                     offset=inicio + desc['offset']).reshape(desc['shape'])
+    return meta, arrays 
+
+def ler_cabecalho_conteiner(caminho: str, magia: bytes, versao: int) -> Optional[Dict]:
+    """Só o cabeçalho JSON (lê poucos bytes, sem mapear os arrays); None se não for o formato"""
+    tamanho_preambulo = struct.calcsize(_FORMATO_PREAMBULO)
+    with open(caminho, 'rb') as f:
+        preambulo = f.read(tamanho_preambulo)
+        if len(preambulo) < tamanho_preambulo:
+            return None
+        magia_lida, versao_lida, tamanho = struct.unpack(_FORMATO_PREAMBULO, preambulo)
+        if magia_lida != magia or versao_lida != versao:
+            return None
+        return json.loads(f.read(tamanho).decode('utf-8')) 
+
+MAGIA_HISTORICO = b'Z9HIST\0\0' 
+
+def gravar_historico(caminho: str, historico: HistoricoColunar):
+    """
+    Grava as colunas do histórico no formato que abrir_historico mapeia sem cópia.
+    O cabeçalho leva o SHA-256 das colunas, calculado uma vez aqui
+    """
+    h = historico
+    colunas = {
+        'concursos': h.concursos, 'dezenas': h.dezenas, 'raizes': h.raizes,
+        'mascaras': h.mascaras, 'somas': h.somas
+    }
+    conteudo = hashlib.sha256()
+    for arr in colunas.values():
+        conteudo.update(np.ascontiguousarray(arr).tobytes())
+    gravar_conteiner(caminho, MAGIA_HISTORICO, VERSAO_HISTORICO,
+                     {'total': len(h), 'sha256': conteudo.hexdigest()}, colunas) 
+
+def impressao_historico(caminho: str) -> Optional[str]:
+    """Hash gravado no cabeçalho de um histórico binário (None para texto ou binários antigos)"""
+    try:
+        cabecalho = ler_cabecalho_conteiner(caminho, MAGIA_HISTORICO, VERSAO_HISTORICO)
+    except (OSError, ValueError, struct.error):
+        return None
+    return cabecalho.get('sha256') if cabecalho else None 
+
+def e_historico_binario(caminho: str) -> bool:
+    with open(caminho, 'rb') as f:
+        return f.read(len(MAGIA_HISTORICO)) == MAGIA_HISTORICO 
+
+def abrir_historico(caminho: str) -> Optional[HistoricoColunar]:
+    """
+    Histórico binário mapeado em memória: as colunas apontam direto para o page
+    cache (vários processos compartilham a mesma cópia). None se não for o formato
+    """
+    if not e_historico_binario(caminho):
+        return None
+    conteudo = abrir_conteiner(caminho, MAGIA_HISTORICO, VERSAO_HISTORICO)
+    if conteudo is None:
+        raise ValueError(f"{caminho}: versão do histórico binário não suportada")
+    _, arrays = conteudo
+    return HistoricoColunar.de_colunas(arrays['concursos'], arrays['dezenas'], arrays['raizes'],
+                                       arrays['mascaras'], arrays['somas']) 
+
+def converter_historico(origem: str, destino: Optional[str] = None) -> LeitorConcursos:
+    """Converte um arquivo de concursos (texto, .gz ou .xz) para o formato binário"""
+    destino = destino or origem + SUFIXO_HISTORICO
+    leitor = LeitorConcursos(origem)
+    historico = HistoricoColunar()
+    for concursos, sorteios in leitor:
+        historico.adicionar_lote(concursos, sorteios)
+    gravar_historico(destino, historico)
+    return leitor 
+
+def _posicao_para_json(p: PosicaoRaiz) -> Dict:
+    d = asdict(p)
+    d['distribuicao'] = list(p.distribuicao.items())
+    d['mc_distribuicao'] = list(p.mc_distribuicao.items())
+    return d 
+
+def _posicao_de_json(d: Dict) -> PosicaoRaiz:
+    d = dict(d)
+    d['distribuicao'] = {int(k): v for k, v in d['distribuicao']}
+    d['mc_distribuicao'] = {k: v for k, v in d['mc_distribuicao']}
+    return PosicaoRaiz(**d) 
 
 # ================================================================================
 # GERENCIADOR DE DADOS
 # ================================================================================ 
 
 class MotorDados:
-    def __init__(self):
-        self.dados: List[Dict] = []
-        self.analytics: Dict[int, DezenaAnalytics] = {}
-        self.matriz_pares: Dict[Tuple[int, int], float] = {}
-        self.cache_raizes: Dict[int, List[int]] = {}
-        self.monte_carlo: Optional[MotorMonteCarlo] = None
-        self._init_cache() 
-
-    def _init_cache(self):
-        for r in range(1, 10):
-            self.cache_raizes[r] = [d for d in range(1, 61) if calcular_raiz(d) == r] 
-
-    def carregar(self, arquivo: str = ARQUIVO_DADOS) -> bool:
-        if not os.path.exists(arquivo):
-            print(f"{COR_VERMELHO}ERRO: {arquivo} não encontrado!{COR_RESET}")
-            return False 
-
-        try:
-            with open(arquivo, 'r', encoding='utf-8') as f:
-                linhas = f.readlines() 
-
-            self.dados = []
-            for num_linha, linha in enumerate(linhas, 1):
-                numeros = re.findall(r'\d+', linha)
-                if len(numeros) >= 6:
-                    try:
-                        dezenas = [int(x) for x in numeros[-6:]]
-                        if all(1 <= d <= 60 for d in dezenas) and len(set(dezenas)) == 6:
-                            raizes = [calcular_raiz(d) for d in dezenas]
-                            self.dados.append({
-                                'concurso': num_linha,
-                                'reais': dezenas,
-                                'raizes': raizes,
-                                'soma': sum(dezenas)
-                            })
-                    except:
-                        continue 
-
-            # Inicializa Monte Carlo
-            self.monte_carlo = MotorMonteCarlo(self) 
-
-            self._processar_analytics()
-            self._construir_matriz()
-            return True 
-
-        except Exception as e:
-            print(f"{COR_VERMELHO}ERRO: {str(e)}{COR_RESET}")
-            return False 
-
-    def _processar_analytics(self):
-        total = len(self.dados)
-        for dezena in range(1, 61):
-            analytics = DezenaAnalytics(valor=dezena, raiz=calcular_raiz(dezena)) 
-
-            atrasos = []
-            ultimas_saidas = []
-            ultimo_idx = -1 
-
-            for idx, jogo in enumerate(reversed(self.dados)):
-                if dezena in jogo['reais']:
-                    if ultimo_idx == -1:
-                        analytics.atraso_atual = idx
-                    else:
-                        atrasos.append(idx - ultimo_idx)
-                    ultimas_saidas.append(total - idx)
-                    ultimo_idx = idx 
-
-            if atrasos:
-                analytics.atraso_medio = sum(atrasos) / len(atrasos)
-                analytics.ciclo_medio = analytics.atraso_medio 
-
-            if atrasos:
-                analytics.atraso_medio = sum(atrasos) / len(atrasos)
-                analytics.ciclo_medio = analytics.atraso_medio 
-
-            analytics.frequencia_total = len(ultimas_saidas)
-            if total > 0:
-                analytics.frequencia_recente = (analytics.frequencia_total / total) * 100 
-
-            if len(ultimas_saidas) >= 2:
-                recentes = ultimas_saidas[:min(5, len(ultimas_saidas))]
-                if len(recentes) >= 2:
-                    analytics.score_momentum = sum(recentes[i] - recentes[i+1] for i in range(len(recentes)-1)) / (len(recentes)-1) 
-
-            if analytics.atraso_medio > 0:
-                lambda_p = 1 / analytics.atraso_medio
-                analytics.probabilidade_saida = (1 - math.exp(-lambda_p * (analytics.atraso_atual + 1))) * 100 
-
-            # Monte Carlo: Simula convergência para esta dezena
-            if self.monte_carlo:
-                sim_mc = self.monte_carlo.simular_distribuicao_raiz(
-                    0, analytics.raiz, MC_ITERACOES_RAIZ // 10
-                )
-                analytics.mc_confianca = sim_mc['confianca']
-                analytics.mc_atrator = sim_mc['atrator'] 
-
-            if analytics.atraso_atual > 22:
-                analytics.status = "frio"
-            elif 1 < analytics.atraso_atual < 10 and analytics.probabilidade_saida > 30:
-                analytics.status = "quente"
-            elif analytics.atraso_atual == 0:
-                analytics.status = "critico"
-            else:
-                analytics.status = "neutro" 
-
-            self.analytics[dezena] = analytics 
-
-    def _construir_matriz(self):
-        pares_count = Counter()
-        total = len(self.dados) 
-
-        for jogo in self.dados:
-            for par in itertools.combinations(sorted(jogo['reais']), 2):
-                pares_count[par] += 1 
-
-        self.matriz_pares = {par: count/total for par, count in pares_count.items()} 
-
-    def get_dezenas_raiz(self, raiz: int) -> List[int]:
-        return self.cache_raizes.get(raiz, []) 
-
-    def get_analytics(self, dezena: int) -> Optional[DezenaAnalytics]:
-        return self.analytics.get(dezena) 
+    def __init__(self, exato: Optional[bool] = None, tolerancia_inercia: float = 0.0):
+        self.historico = HistoricoColunar()
+        self.exato = exato  # Modo exato do Monte Carlo (None = MC_MODO_EXATO na criação do motor MC)
+        self.analytics: Dict[int, DezenaAnalytics] = {}
+        self.contagem_pares = np.zeros((60, 60), dtype=np.int64)
+        self.matriz_pares: Mapping[Tuple[int, int], float] = VisaoPares(self.contagem_pares, self.historico)
+        self._matriz_densa: Optional[np.ndarray] = None
+        self._densa_total = -1
+        self._indice: Optional[IndiceInvertido] = None
+        self._indice_chave: Optional[Tuple[int, int]] = None
+        self._cubo = CuboFrequencias()
+        self.cache_raizes: Dict[int, List[int]] = {}
+        self.monte_carlo: Optional[MotorMonteCarlo] = None
+        self.inercias_cache: Optional[List[PosicaoRaiz]] = None
+        # Somas de inércia do histórico atual, avançadas também por adicionar_concurso
+        self.acumulador_inercia = AcumuladorInercia(tolerancia_inercia)
+        self.versao = 0  # Incrementa a cada mudança do histórico (invalida caches derivados)
+        self._snapshot: Optional[Tuple[str, str]] = None  # (caminho, chave)
+        self.erro: Optional[str] = None
+        self.linhas_rejeitadas: List[Tuple[int, str]] = []
+        self.total_rejeitadas = 0
+        self._init_cache()
+        self._reiniciar_saidas() 
+
+    def _init_cache(self):
+        for r in range(1, 10):
+            self.cache_raizes[r] = [d for d in range(1, 61) if calcular_raiz(d) == r] 
+
+    @property
+    def dados(self) -> VisaoDados:
+        """Compatibilidade: sorteios como dicts (concurso, reais, raizes, soma)"""
+        return VisaoDados(self.historico) 
+
+    @dados.setter
+    def dados(self, registros: List[Dict]):
+        self._invalidar_snapshot()
+        self.historico = HistoricoColunar(len(registros))
+        self.historico.adicionar_lote([r['concurso'] for r in registros],
+                                      [r['reais'] for r in registros]) 
+
+    def carregar(self, arquivo: str = ARQUIVO_DADOS, usar_snapshot: bool = USAR_SNAPSHOT,
+                 verboso: bool = True, chave: Optional[str] = None) -> bool:
+        """
+        Carrega o histórico; em caso de falha a mensagem fica em self.erro (e é
+        impressa se verboso). `chave` reaproveita uma chave_snapshot já calculada
+        """
+        self.erro = None
+        if not os.path.exists(arquivo):
+            self.erro = f"{arquivo} não encontrado!"
+            if verboso:
+                print(f"{COR_VERMELHO}ERRO: {self.erro}{COR_RESET}")
+            return False 
+
+        try:
+            self._invalidar_snapshot()
+            if usar_snapshot:
+                caminho_snapshot = arquivo + SUFIXO_SNAPSHOT
+                chave = chave or self.chave_snapshot(arquivo)
+                if self._restaurar_snapshot(caminho_snapshot, chave):
+                    return True 
+
+            # Histórico binário: colunas mapeadas direto, sem parse
+            historico = abrir_historico(arquivo)
+            self.linhas_rejeitadas, self.total_rejeitadas = [], 0
+            if historico is None:
+                # Leitura em fluxo: o histórico é preenchido bloco a bloco
+                leitor = LeitorConcursos(arquivo)
+                historico = HistoricoColunar()
+                for concursos, sorteios in leitor:
+                    historico.adicionar_lote(concursos, sorteios)
+                self.linhas_rejeitadas = leitor.rejeitadas
+                self.total_rejeitadas = leitor.total_rejeitadas
+                if verboso and leitor.total_rejeitadas:
+                    amostra = ', '.join(str(linha) for linha, _ in leitor.rejeitadas[:10])
+                    print(f"{COR_AMARELO}AVISO: {leitor.total_rejeitadas} linha(s) recusada(s) em "
+                          f"{arquivo} (linhas {amostra}){COR_RESET}") 
+
+            self._adotar_historico(historico) 
+
+            if usar_snapshot:
+                self._snapshot = (caminho_snapshot, chave)
+                self.salvar_snapshot()
+            return True 
+
+        except Exception as e:
+            self.erro = str(e)
+            if verboso:
+                print(f"{COR_VERMELHO}ERRO: {self.erro}{COR_RESET}")
+            return False 
+
+    def carregar_sorteios(self, concursos, sorteios, semente=None):
+        """
+        Substitui o histórico por sorteios já validados e refaz analytics e pares
+        (`semente` alimenta o Monte Carlo antes do cálculo, para resultados reprodutíveis)
+        """
+        historico = HistoricoColunar(len(sorteios))
+        historico.adicionar_lote(concursos, sorteios)
+        self._adotar_historico(historico, semente) 
+
+    def _adotar_historico(self, historico: HistoricoColunar, semente=None):
+        self._invalidar_snapshot()
+        self.historico = historico 
+
+        # Inicializa Monte Carlo
+        self.monte_carlo = MotorMonteCarlo(self, semente=semente, exato=self.exato) 
+
+        with PERFIL.etapa('analytics'):
+            self._processar_analytics()
+        with PERFIL.etapa('matriz_pares'):
+            self._construir_matriz() 
+
+    def resemear(self, semente):
+        """
+        Refaz as análises Monte Carlo com `semente` (resultado reprodutível).
+        O estado passa a depender da semente, então o snapshot é desligado para
+        este motor: o arquivo em disco continua com as análises do carregamento
+        """
+        self._invalidar_snapshot()
+        if self.monte_carlo is None:
+            self.monte_carlo = MotorMonteCarlo(self, exato=self.exato)
+        self.monte_carlo.rng = np.random.default_rng(semente)
+        self._processar_analytics() 
+
+    def adicionar_concurso(self, dezenas: List[int], concurso: Optional[int] = None):
+        """
+        Acrescenta um resultado novo sem recarregar o arquivo. Atrasos, frequências,
+        momentum e pares: O(60 + 15), idênticos a um rebuild completo. Inércia: o
+        sorteio entra no acumulador do motor (com tolerancia_inercia = 0 reancora
+        numa passada vetorizada, exato; com > 0 é O(54) e aproximado, ver
+        AcumuladorInercia). Os campos Monte Carlo (mc_confianca, mc_atrator) são
+        reamostrados com 9 simulações, uma por raiz, como no rebuild, mas não
+        reproduzem os números dele (outra sequência aleatória)
+        """
+        dezenas = [int(d) for d in dezenas]
+        if len(dezenas) != 6 or not all(1 <= d <= 60 for d in dezenas) or len(set(dezenas)) != 6:
+            raise ValueError(f"Concurso inválido: {dezenas}")
+        if concurso is None:
+            concurso = int(self.historico.concursos[-1]) + 1 if len(self.historico) else 1 
+
+        self._invalidar_snapshot()
+        idx = len(self.historico)
+        self.historico.adicionar(concurso, dezenas)
+        if self.monte_carlo is None:
+            self.monte_carlo = MotorMonteCarlo(self, exato=self.exato) 
+
+        self._registrar_saidas(idx, dezenas)
+        indices = np.array(dezenas) - 1
+        self.contagem_pares[indices[:, None], indices] += 1
+        self.contagem_pares[indices, indices] -= 1
+        self.acumulador_inercia.atualizar(self.historico) 
+
+        mc_raizes = self._simular_raizes()
+        for dezena in range(1, 61):
+            self.analytics[dezena] = self._derivar_analytics(dezena, mc_raizes) 
+
+    # --- Snapshot em disco ---------------------------------------------------- 
+
+    @staticmethod
+    def chave_snapshot(arquivo: str) -> str:
+        """
+        Hash do conteúdo do arquivo + versão do formato + parâmetros Monte Carlo.
+        Históricos binários trazem o hash no cabeçalho: só ele e o tamanho são lidos
+        """
+        h = hashlib.sha256()
+        impressao = impressao_historico(arquivo)
+        if impressao:
+            h.update(f"{SUFIXO_HISTORICO}:{impressao}:{os.path.getsize(arquivo)}".encode())
+        else:
+            with open(arquivo, 'rb') as f:
+                for bloco in iter(lambda: f.read(1 << 20), b''):
+                    h.update(bloco)
+        h.update(json.dumps(MotorDados.parametros_analise()).encode())
+        return h.hexdigest() 
+
+    @staticmethod
+    def parametros_analise() -> List:
+        """Versão do formato + parâmetros Monte Carlo que afetam as análises guardadas"""
+        return [VERSAO_SNAPSHOT, MC_ITERACOES_RAIZ, MC_ITERACOES_JOGO, MC_JANELA_TEMPORAL,
+                MC_MODO_EXATO, MC_CONVERGENCIA_LIMITE, MC_CONVERGENCIA_LIMITE_JOGO,
+                MC_LOTE_CONVERGENCIA, MC_LOTES_MINIMOS, ATRATOR_JANELA, ATRATOR_MAX_LAG] 
+
+    @property
+    def chave_carregada(self) -> Optional[str]:
+        """Chave do snapshot do arquivo carregado (None sem snapshot ou após alterações)"""
+        return self._snapshot[1] if self._snapshot else None 
+
+    def registrar_inercias(self, inercias: List[PosicaoRaiz]):
+        """Guarda as inércias do histórico atual (e no snapshot, se houver)"""
+        self.inercias_cache = inercias
+        if self._snapshot:
+            self.salvar_snapshot() 
+
+    def _invalidar_snapshot(self):
+        self.versao += 1
+        self._snapshot = None
+        self.inercias_cache = None 
+
+    def salvar_snapshot(self):
+        if not self._snapshot:
+            return
+        caminho, chave = self._snapshot
+        h = self.historico
+        recentes = np.zeros((61, 5), dtype=np.int64)
+        for d in range(61):
+            saidas = list(self._saidas_recentes[d])
+            recentes[d, :len(saidas)] = saidas
+        meta = {
+            'chave': chave,
+            'analytics': [asdict(a) for a in self.analytics.values()],
+            'inercias': [_posicao_para_json(p) for p in self.inercias_cache] if self.inercias_cache else None,
+            'rejeitadas': self.linhas_rejeitadas,
+            'total_rejeitadas': self.total_rejeitadas
+        }
+        arrays = {
+            'concursos': h.concursos, 'dezenas': h.dezenas, 'raizes': h.raizes,
+            'mascaras': h.mascaras, 'somas': h.somas, 'pares': self.contagem_pares,
+            'frequencias': np.array(self._frequencias, dtype=np.int64),
+            'primeira_saida': np.array(self._primeira_saida, dtype=np.int64),
+            'ultima_saida': np.array(self._ultima_saida, dtype=np.int64),
+            'saidas_recentes': recentes
+        }
+        try:
+            gravar_conteiner(caminho, MAGIA_SNAPSHOT, VERSAO_SNAPSHOT, meta, arrays)
+        except OSError:
+            pass  # Sem permissão de escrita: segue sem cache 
+
+    def _restaurar_snapshot(self, caminho: str, chave: str) -> bool:
+        """Carrega o snapshot se existir, tiver a mesma versão e a mesma chave"""
+        if not os.path.exists(caminho):
+            return False
+        try:
+            conteudo = abrir_conteiner(caminho, MAGIA_SNAPSHOT, VERSAO_SNAPSHOT)
+        except (OSError, ValueError, struct.error):
+            return False
+        if conteudo is None or conteudo[0].get('chave') != chave:
+            return False
+        meta, arrays = conteudo 
+
+        self.historico = HistoricoColunar.de_colunas(
+            arrays['concursos'], arrays['dezenas'], arrays['raizes'], arrays['mascaras'], arrays['somas']
+        )
+        self.monte_carlo = MotorMonteCarlo(self, exato=self.exato)
+        self.analytics = {a['valor']: DezenaAnalytics(**a) for a in meta['analytics']}
+        self.contagem_pares = np.array(arrays['pares'])
+        self.matriz_pares = VisaoPares(self.contagem_pares, self.historico)
+        self._densa_total = -1 
+
+        self._frequencias = arrays['frequencias'].tolist()
+        self._primeira_saida = arrays['primeira_saida'].tolist()
+        self._ultima_saida = arrays['ultima_saida'].tolist()
+        self._saidas_recentes = [deque(linha[:f], maxlen=5) for linha, f in
+                                 zip(arrays['saidas_recentes'].tolist(), self._frequencias)] 
+
+        if meta['inercias']:
+            self.inercias_cache = [_posicao_de_json(p) for p in meta['inercias']]
+        self.linhas_rejeitadas = [tuple(r) for r in meta.get('rejeitadas', [])]
+        self.total_rejeitadas = meta.get('total_rejeitadas', 0)
+        self._snapshot = (caminho, chave)
+        return True 
+
+    def _reiniciar_saidas(self):
+        # Estado acumulado por dezena (índice = dezena)
+        self._frequencias = [0] * 61
+        self._ultima_saida = [-1] * 61
+        self._primeira_saida = [-1] * 61
+        self._saidas_recentes = [deque(maxlen=5) for _ in range(61)] 
+
+    def _registrar_saidas(self, idx: int, dezenas: List[int]):
+        for d in dezenas:
+            if self._primeira_saida[d] < 0:
+                self._primeira_saida[d] = idx
+            self._ultima_saida[d] = idx
+            self._frequencias[d] += 1
+            self._saidas_recentes[d].appendleft(idx + 1) 
+
+    def _processar_analytics(self):
+        # Uma passada pelo histórico (índice invertido); o resto sai dos extremos de cada lista
+        indice = self.indice
+        self._frequencias = indice.frequencias.tolist()
+        self._primeira_saida = indice.primeiras().tolist()
+        self._ultima_saida = indice.ultimas().tolist()
+        self._saidas_recentes = [deque(r, maxlen=5) for r in indice.recentes(5)] 
+
+        mc_raizes = self._simular_raizes()
+        for dezena in range(1, 61):
+            self.analytics[dezena] = self._derivar_analytics(dezena, mc_raizes) 
+
+    def _simular_raizes(self) -> Dict[int, Dict]:
+        """Simulação MC da raiz na posição 1, uma por raiz (as 60 dezenas só têm 9 raízes)"""
+        if not self.monte_carlo:
+            return {}
+        return {r: self.monte_carlo.simular_distribuicao_raiz(0, r, max(1, MC_ITERACOES_RAIZ // 10))
+                for r in range(1, 10)} 
+
+    def _derivar_analytics(self, dezena: int, mc_raizes: Optional[Dict[int, Dict]] = None) -> DezenaAnalytics:
+        total = len(self.historico)
+        analytics = DezenaAnalytics(valor=dezena, raiz=calcular_raiz(dezena)) 
+
+        frequencia = self._frequencias[dezena]
+        if frequencia:
+            analytics.atraso_atual = total - 1 - self._ultima_saida[dezena] 
+
+        # Soma dos intervalos entre saídas consecutivas = última - primeira
+        if frequencia >= 2:
+            soma_atrasos = self._ultima_saida[dezena] - self._primeira_saida[dezena]
+            analytics.atraso_medio = soma_atrasos / (frequencia - 1)
+            analytics.ciclo_medio = analytics.atraso_medio 
+
+        analytics.frequencia_total = frequencia
+        if total > 0:
+            analytics.frequencia_recente = (analytics.frequencia_total / total) * 100 
+
+        recentes = list(self._saidas_recentes[dezena])
+        if len(recentes) >= 2:
+            analytics.score_momentum = sum(recentes[i] - recentes[i+1] for i in range(len(recentes)-1)) / (len(recentes)-1) 
+
+        if analytics.atraso_medio > 0:
+            lambda_p = 1 / analytics.atraso_medio
+            analytics.probabilidade_saida = (1 - math.exp(-lambda_p * (analytics.atraso_atual + 1))) * 100 
+
+        # Monte Carlo: convergência da raiz desta dezena (compartilhada entre dezenas da mesma raiz)
+        if mc_raizes is None:
+            mc_raizes = self._simular_raizes()
+        sim_mc = mc_raizes.get(analytics.raiz)
+        if sim_mc:
+            analytics.mc_confianca = sim_mc['confianca']
+            analytics.mc_atrator = sim_mc['atrator'] 
+
+        if analytics.atraso_atual > 22:
+            analytics.status = "frio"
+        elif 1 < analytics.atraso_atual < 10 and analytics.probabilidade_saida > 30:
+            analytics.status = "quente"
+        elif analytics.atraso_atual == 0:
+            analytics.status = "critico"
+        else:
+            analytics.status = "neutro" 
+
+        return analytics 
+
+    def _construir_matriz(self):
+        self.contagem_pares = contar_pares(self.historico.dezenas)
+        self.matriz_pares = VisaoPares(self.contagem_pares, self.historico)
+        self._densa_total = -1 
+
+    @property
+    def matriz_densa(self) -> np.ndarray:
+        """Frequência por concurso de cada par: float32 60×60 simétrica (índice d-1)"""
+        total = len(self.historico)
+        if self._densa_total != total:
+            self._matriz_densa = (self.contagem_pares / max(total, 1)).astype(np.float32)
+            self._densa_total = total
+        return self._matriz_densa 
+
+    @property
+    def indice(self) -> IndiceInvertido:
+        """Índice invertido dezena → sorteios, reconstruído quando o histórico muda"""
+        chave = (self.versao, len(self.historico))
+        if self._indice is None or self._indice_chave != chave:
+            self._indice = IndiceInvertido(self.historico.dezenas)
+            self._indice_chave = chave
+        return self._indice 
+
+    def ocorrencias(self, dezena: int) -> np.ndarray:
+        """Índices dos sorteios (do mais antigo ao mais recente) em que a dezena saiu"""
+        return self.indice.ocorrencias(dezena) 
+
+    @property
+    def cubo(self) -> CuboFrequencias:
+        """Contagens por janela arbitrária do histórico atual (atualizado sob demanda)"""
+        self._cubo.atualizar(self.historico)
+        return self._cubo 
+
+    def get_dezenas_raiz(self, raiz: int) -> List[int]:
+        return self.cache_raizes.get(raiz, []) 
+
+    def get_analytics(self, dezena: int) -> Optional[DezenaAnalytics]:
+        return self.analytics.get(dezena) 
+
+    def frequencias_dezenas(self) -> np.ndarray:
+        """Quantidade de saídas de cada dezena (índice = dezena)"""
+        return np.array(self._frequencias, dtype=np.int64) 
 
 # ================================================================================
 # ANALISADOR DE INÉRCIA COM MONTE CARLO
 # ================================================================================ 
 
+class AcumuladorInercia:
+    """
+    Somas de peso exponencial por (posição, raiz), peso do sorteio i = 4.8^(15·i/T). 
+
+    Como o expoente depende de T, todos os pesos mudam quando o histórico cresce.
+    Com tolerancia = 0 cada crescimento reancora (recalcula numa passada vetorizada)
+    e o resultado é idêntico ao laço original. Com tolerancia > 0 o decaimento da
+    âncora é mantido: cada sorteio novo reescala as somas 6×9 em O(9×6) e soma 1
+    na sua raiz; só reancora quando T passa de T_âncora·(1 + tolerancia). 
+
+    O modo incremental é aproximado. Medido em DEZENAS.txt (666 concursos),
+    acrescentando um sorteio por vez a partir de 100, 300 e 600 concursos, o
+    maior desvio da distribuição normalizada ficou em torno de 0.27·tolerancia
+    (2.7e-3 com 0.01, 5.1e-3 com 0.02, 1.3e-2 com 0.05). A raiz dominante pode
+    trocar quando duas raízes estão quase empatadas: de 2 a 42 posições·passo
+    nessas mesmas séries. medir_deriva repete a medição para outro histórico
+    """ 
+
+    BASE = 4.8
+    EXPOENTE = 15 
+
+    def __init__(self, tolerancia: float = 0.0):
+        self.tolerancia = tolerancia
+        self.total = 0
+        self.ancora = 0
+        self.somas = np.zeros((6, 10))
+        self.primeira_saida = np.full((6, 10), -1, dtype=np.int64)
+        self._ultima_mascara = None
+        self._decaimento = 1.0
+        self._peso_recente = 1.0
+        self._normalizadas = False 
+
+    def atualizar(self, historico: HistoricoColunar):
+        """Incorpora os sorteios novos do histórico (ou reancora se ele foi trocado)"""
+        total = len(historico)
+        trocado = total < self.total or (
+            self.total and historico.mascaras[self.total - 1] != self._ultima_mascara
+        )
+        if trocado or self.total == 0 or total > self.ancora * (1 + self.tolerancia):
+            self.reancorar(historico)
+            return 
+
+        if not self._normalizadas and total > self.total:
+            # Passa a escala relativa: o sorteio mais recente pesa 1
+            self.somas = self.somas / self._peso_recente
+            self._normalizadas = True
+        for idx in range(self.total, total):
+            linha = historico.raizes[idx].astype(np.int64)
+            self.somas *= self._decaimento
+            self.somas[np.arange(6), linha] += 1
+            novas = self.primeira_saida[np.arange(6), linha] < 0
+            self.primeira_saida[np.arange(6)[novas], linha[novas]] = idx
+        self.total = total
+        self._ultima_mascara = historico.mascaras[total - 1] 
+
+    def reancorar(self, historico: HistoricoColunar):
+        """Recalcula as somas exatas para o T atual numa única passada"""
+        raizes = historico.raizes
+        total = len(raizes)
+        self.total = self.ancora = total
+        self.somas = np.zeros((6, 10))
+        self.primeira_saida = np.full((6, 10), -1, dtype=np.int64)
+        self._normalizadas = False
+        if total == 0:
+            self._ultima_mascara = None
+            return 
+
+        # Pesos com math.pow (np.power vetorizado difere no último bit em alguns
+        # expoentes): T chamadas compartilhadas pelas 6 posições em vez de 6·T.
+        # bincount acumula na ordem dos índices, como o laço original
+        pesos = np.fromiter((math.pow(self.BASE, (i / total) * self.EXPOENTE) for i in range(total)),
+                            dtype=np.float64, count=total)
+        chaves = (raizes.astype(np.int64) + np.arange(6) * 10).ravel()
+        self.somas = np.bincount(chaves, weights=np.repeat(pesos, 6), minlength=60).reshape(6, 10)
+        for pos in range(6):
+            valores, primeiros = np.unique(raizes[:, pos], return_index=True)
+            self.primeira_saida[pos, valores] = primeiros 
+
+        self._peso_recente = pesos[-1]
+        self._decaimento = math.pow(self.BASE, -self.EXPOENTE / total)
+        self._ultima_mascara = historico.mascaras[total - 1] 
+
+    def scores(self, pos: int) -> Dict[int, float]:
+        """Scores da posição na ordem da primeira aparição de cada raiz (como o dict original)"""
+        raizes = np.flatnonzero(self.primeira_saida[pos] >= 0)
+        raizes = raizes[np.argsort(self.primeira_saida[pos, raizes], kind='stable')]
+        return {int(r): float(self.somas[pos, r]) for r in raizes} 
+
+    @classmethod
+    def medir_deriva(cls, historico: HistoricoColunar, tolerancia: float, inicio: int) -> Dict:
+        """
+        Reproduz o histórico a partir de `inicio` sorteios, um por vez, com o modo
+        incremental e com o exato: maior desvio da distribuição normalizada e
+        quantas vezes (posição·passo) a raiz dominante diferiu
+        """
+        parcial = HistoricoColunar()
+        parcial.adicionar_lote(historico.concursos[:inicio].tolist(), historico.dezenas[:inicio].tolist())
+        incremental, exato = cls(tolerancia), cls(0.0)
+        incremental.atualizar(parcial)
+        pior, trocas = 0.0, 0
+        for idx in range(inicio, len(historico)):
+            parcial.adicionar(int(historico.concursos[idx]), historico.dezenas[idx].tolist())
+            incremental.atualizar(parcial)
+            exato.atualizar(parcial)
+            a = incremental.somas / incremental.somas.sum(axis=1, keepdims=True)
+            e = exato.somas / exato.somas.sum(axis=1, keepdims=True)
+            pior = max(pior, float(np.abs(a - e).max()))
+            trocas += int((a.argmax(axis=1) != e.argmax(axis=1)).sum())
+        return {'tolerancia': tolerancia, 'inicio': inicio, 'passos': max(0, len(historico) - inicio),
+                'desvio_maximo': pior, 'trocas_raiz_dominante': trocas} 
+
 class AnalisadorInercia:
-    def __init__(self, motor: MotorDados):
-        self.motor = motor
-        self.resultados: List[PosicaoRaiz] = [] 
-
-    def analisar(self) -> List[PosicaoRaiz]:
-        dados = self.motor.dados
-        total = len(dados) 
-
-        if total == 0:
-            return [] 
-
-        self.resultados = [] 
-
-        for pos in range(6):
-            raizes_pos = [j['raizes'][pos] for j in dados] 
-
-            scores = defaultdict(float)
-            for idx, raiz in enumerate(raizes_pos):
-                peso = math.pow(4.8, (idx / total) * 15) if total > 0 else 1
-                scores[raiz] += peso 
-
-            raiz_dom = max(scores, key=scores.get) 
-
-            total_score = sum(scores.values())
-            distrib = {r: s/total_score for r, s in scores.items()} 
-
-            ultimos_15 = raizes_pos[-15:]
-           freq = sum(1 for r in ultimos_15 if r == raiz_dom) / 15 
-
-            if freq >= 0.40:
-                tendencia = "+"
-                forca = freq * 100
-            elif freq <= 0.10:
-                tendencia = "-"
-                forca = (1 - freq) * 50
-            else:
-                tendencia = "/"
-                forca = 50 
-
-            entropia = -sum(p * math.log2(p) for p in distrib.values() if p > 0)
-            confianca = (distrib[raiz_dom] * 0.6 + (1 - entropia/math.log2(9)) * 0.4) * 100 
-
-            # MONTE CARLO: Refina com simulação
-            mc_resultado = None
-            if self.motor.monte_carlo:
-                mc_resultado = self.motor.monte_carlo.simular_distribuicao_raiz(pos, raiz_dom)
-                # Ajusta confiança com resultado MC
-                confianca = confianca * 0.6 + mc_resultado['confianca'] * 100 * 0.4 
-
-            # Detecta atrator estranho
-            atrator = None
-            if self.motor.monte_carlo:
-                atrator = self.motor.monte_carlo.detectar_atrator_estranho(pos) 
-
-            self.resultados.append(PosicaoRaiz(
-                posicao=pos + 1,
-                raiz_dominante=raiz_dom,
-                tendencia=tendencia,
-                forca=forca,
-                distribuicao=distrib,
-                confianca=min(confianca, 100),
-                mc_distribuicao=mc_resultado['distribuicao'] if mc_resultado else {},
-                mc_entropia=mc_resultado['variancia'] if mc_resultado else 0,
-                mc_atrator_stranho=atrator
-            )) 
-
-        return self.resultados 
+    def __init__(self, motor: MotorDados, tolerancia: Optional[float] = None):
+        """Sem `tolerancia` usa o acumulador do motor (o que adicionar_concurso mantém em dia)"""
+        self.motor = motor
+        self.resultados: List[PosicaoRaiz] = []
+        self.acumulador = motor.acumulador_inercia if tolerancia is None else AcumuladorInercia(tolerancia) 
+
+    def analisar(self) -> List[PosicaoRaiz]:
+        if self.motor.inercias_cache is not None:
+            self.resultados = self.motor.inercias_cache
+            return self.resultados 
+
+        raizes = self.motor.historico.raizes
+        total = len(raizes) 
+
+        if total == 0:
+            return [] 
+
+        self.resultados = []
+        self.acumulador.atualizar(self.motor.historico) 
+
+        for pos in range(6):
+            scores = self.acumulador.scores(pos) 
+
+            raiz_dom = max(scores, key=scores.get) 
+
+            total_score = sum(scores.values())
+            distrib = {r: s/total_score for r, s in scores.items()} 
+
+            freq = int(self.motor.cubo.distribuicao_raiz(pos, -15)[raiz_dom]) / 15 
+
+            if freq >= 0.40:
+                tendencia = "+"
+                forca = freq * 100
+            elif freq <= 0.10:
+                tendencia = "-"
+                forca = (1 - freq) * 50
+            else:
+                tendencia = "/"
+                forca = 50 
+
+            entropia = -sum(p * math.log2(p) for p in distrib.values() if p > 0)
+            confianca = (distrib[raiz_dom] * 0.6 + (1 - entropia/math.log2(9)) * 0.4) * 100 
+
+            # MONTE CARLO: Refina com simulação
+            mc_resultado = None
+            if self.motor.monte_carlo:
+                mc_resultado = self.motor.monte_carlo.simular_distribuicao_raiz(pos, raiz_dom)
+                # Ajusta confiança com resultado MC
+                confianca = confianca * 0.6 + mc_resultado['confianca'] * 100 * 0.4 
+
+            # Detecta atrator estranho
+            atrator = None
+            if self.motor.monte_carlo:
+                atrator = self.motor.monte_carlo.detectar_atrator_estranho(pos) 
+
+            self.resultados.append(PosicaoRaiz(
+                posicao=pos + 1,
+                raiz_dominante=raiz_dom,
+                tendencia=tendencia,
+                forca=forca,
+                distribuicao=distrib,
+                confianca=min(confianca, 100),
+                mc_distribuicao=mc_resultado['distribuicao'] if mc_resultado else {},
+                mc_entropia=mc_resultado['variancia'] if mc_resultado else 0,
+                mc_atrator_stranho=atrator
+            )) 
+
+        self.motor.registrar_inercias(self.resultados)
+        return self.resultados 
 
 # ================================================================================
 # CLASSIFICADOR TÉRMICO
 # ================================================================================ 
 
 class ClassificadorTermico:
-    def __init__(self, motor: MotorDados):
-        self.motor = motor 
-
-    def classificar(self, dezena: int, pos: int, inercia: PosicaoRaiz) -> Dict:
-        analytics = self.motor.get_analytics(dezena)
-        if not analytics:
-            return {'status': '(?)', 'score': 0, 'cor': COR_BRANCO} 
-
-        raiz_d = analytics.raiz
-        raiz_alvo = inercia.raiz_dominante 
-
-        score = 0
-        if raiz_d == raiz_alvo:
-            score += 40
-            # Bônus Monte Carlo se raiz convergir com atrator
-            if inercia.mc_atrator_stranho and raiz_d == inercia.mc_atrator_stranho % 9 + 1:
-                score += 10 
-
-        if 1 < analytics.atraso_atual < 10:
-            score += 25
-        if analytics.probabilidade_saida > 35:
-            score += 15
-        if analytics.score_momentum > analytics.ciclo_medio * 0.8:
-            score += 10
-        if analytics.status == "quente":
-            score += 10 
-
-        # Bônus Monte Carlo
-        score += analytics.mc_confianca * 10 
-
-        if score >= 70:
-            status = "(+)"
-            cor = COR_VERDE
-        elif score <= 20 or analytics.atraso_atual > 25:
-            status = "(-)"
-            cor = COR_VERMELHO
-  elif score <= 20 or analytics.atraso_atual > 25:
-            status = "(-)"
-            cor = COR_VERMELHO
-        elif analytics.status == "critico":
-            status = "(!)"
-            cor = COR_AMARELO
-        else:
-            status = "(/)"
-            cor = COR_CIANO 
-
-        return {'status': status, 'score': score, 'cor': cor} 
+    def __init__(self, motor: MotorDados):
+        self.motor = motor
+        self._tabela: Optional[np.ndarray] = None
+        self._tabela_chave: Optional[Tuple] = None 
+
+    def tabela_scores(self, inercias: List[PosicaoRaiz]) -> np.ndarray:
+        """Score de classificar() para cada (posição, dezena): matriz 6×61, refeita só se o estado mudar"""
+        chave = (self.motor.versao, inercias)
+        if self._tabela_chave is None or self._tabela_chave[0] != chave[0] or self._tabela_chave[1] is not inercias:
+            self._tabela = np.zeros((len(inercias), 61))
+            for pos, inercia in enumerate(inercias):
+                for dezena in range(1, 61):
+                    self._tabela[pos, dezena] = self.classificar(dezena, pos, inercia)['score']
+            self._tabela_chave = chave
+        return self._tabela 
+
+    def classificar(self, dezena: int, pos: int, inercia: PosicaoRaiz) -> Dict:
+        analytics = self.motor.get_analytics(dezena)
+        if not analytics:
+            return {'status': '(?)', 'score': 0, 'cor': COR_BRANCO} 
+
+        raiz_d = analytics.raiz
+        raiz_alvo = inercia.raiz_dominante 
+
+        score = 0
+        if raiz_d == raiz_alvo:
+            score += 40
+            # Bônus Monte Carlo se raiz convergir com atrator
+            if inercia.mc_atrator_stranho and raiz_d == inercia.mc_atrator_stranho % 9 + 1:
+                score += 10 
+
+        if 1 < analytics.atraso_atual < 10:
+            score += 25
+        if analytics.probabilidade_saida > 35:
+            score += 15
+        if analytics.score_momentum > analytics.ciclo_medio * 0.8:
+            score += 10
+        if analytics.status == "quente":
+            score += 10 
+
+        # Bônus Monte Carlo
+        score += analytics.mc_confianca * 10 
+
+        if score >= 70:
+            status = "(+)"
+            cor = COR_VERDE
+        elif score <= 20 or analytics.atraso_atual > 25:
+            status = "(-)"
+            cor = COR_VERMELHO
+        elif analytics.status == "critico":
+            status = "(!)"
+            cor = COR_AMARELO
+        else:
+            status = "(/)"
+            cor = COR_CIANO 
+
+        return {'status': status, 'score': score, 'cor': cor} 
 
 # ================================================================================
 # MOTOR DE PRECISÃO COM MONTE CARLO
 # ================================================================================ 
 
 class MotorPrecisao:
-    def __init__(self, motor: MotorDados, classificador: ClassificadorTermico):
-        self.motor = motor
-        self.classificador = classificador 
-
-    def calcular(self, dezenas: List[int], inercias: List[PosicaoRaiz]) -> float:
-        # 1. Sinal de tendência (40%)
-        scores_sinal = []
-        for i, d in enumerate(dezenas):
-            c = self.classificador.classificar(d, i, inercias[i])
-            scores_sinal.append(c['score']) 
-
-        pesos_pos = [1.2, 1.15, 1.1, 1.05, 1.0, 0.95]
-        nota_sinal = sum(s * p for s, p in zip(scores_sinal, pesos_pos)) / sum(pesos_pos)
-        if all(s > 50 for s in scores_sinal):
-            nota_sinal *= 1.1 
-
-        # 2. Força histórica (20%)
-        pares = list(itertools.combinations(sorted(dezenas), 2))
-        score_hist = sum(self.motor.matriz_pares.get(par, 0) for par in pares) / len(pares) * 1000 if pares else 0
-        nota_hist = min(score_hist, 100) 
-
-        # 3. Correlação (15%)
-        nota_corr = 100.0
-        for par in pares:
-            if self.motor.matriz_pares.get(par, 0) < 0.001:
-                nota_corr -= 15 
-
-        # 4. Balanceamento (10%)
-        nota_bal = 100.0
-        pares_count = len([d for d in dezenas if d % 2 == 0])
-        if abs(pares_count - 3) > 1:
-            nota_bal -= 20 
-
-        # 5. Entropia (5%)
-        ent = calcular_entropia(dezenas)
-        nota_ent = 100 if 2.0 <= ent <= 2.5 else 70 if 1.5 <= ent <= 2.8 else 40 
-
-        # 6. MONTE CARLO (10%) - Novo!
-        nota_mc = 0
-        if self.motor.monte_carlo:
-            resultado_mc = self.motor.monte_carlo.simular_jogo_completo(dezenas, MC_ITERACOES_JOGO // 10)
-            nota_mc = resultado_mc['score_mc'] 
-
-        final = (
-            min(nota_sinal, 100) * 0.40 +
-            nota_hist * 0.20 +
-            max(0, nota_corr) * 0.15 +
-            nota_bal * 0.10 +
-            nota_ent * 0.05 +         nota_mc * 0.10  # Monte Carlo weight
-        ) 
-
-        return min(final, 100.0) 
+    PESOS_POSICAO = np.array([1.2, 1.15, 1.1, 1.05, 1.0, 0.95]) 
+
+    def __init__(self, motor: MotorDados, classificador: ClassificadorTermico):
+        self.motor = motor
+        self.classificador = classificador 
+
+    def calcular(self, dezenas: List[int], inercias: List[PosicaoRaiz]) -> float:
+        return float(self.calcular_lote([dezenas], inercias)[0]) 
+
+    def calcular_lote(self, matriz_jogos, inercias: List[PosicaoRaiz],
+                      monte_carlo: bool = True) -> np.ndarray:
+        """
+        Precisão de K jogos (matriz K×6) numa única passada vetorizada.
+        monte_carlo=False omite a parcela MC (nota barata para triagem de candidatos)
+        """
+        jogos = np.asarray(matriz_jogos, dtype=np.int64).reshape(-1, 6) 
+
+        # 1. Sinal de tendência (40%)
+        scores_sinal = self.classificador.tabela_scores(inercias)[np.arange(6), jogos]
+        nota_sinal = scores_sinal @ self.PESOS_POSICAO / self.PESOS_POSICAO.sum()
+        nota_sinal = np.where((scores_sinal > 50).all(axis=1), nota_sinal * 1.1, nota_sinal) 
+
+        # 2. Força histórica (20%)
+        i, j = indices_pares(6)
+        freq_pares = self.motor.matriz_densa[jogos[:, i] - 1, jogos[:, j] - 1]
+        PERFIL.contar('consultas_pares', freq_pares.size)
+        nota_hist = np.minimum(freq_pares.mean(axis=1) * 1000, 100) 
+
+        # 3. Correlação (15%)
+        nota_corr = 100.0 - 15 * np.count_nonzero(freq_pares < 0.001, axis=1) 
+
+        # 4. Balanceamento (10%)
+        pares_count = np.count_nonzero(jogos % 2 == 0, axis=1)
+        nota_bal = np.where(np.abs(pares_count - 3) > 1, 80.0, 100.0) 
+
+        # 5. Entropia (5%): cada bola contribui -log2(m/6)/6, m = repetições do seu valor
+        multiplicidade = (jogos[:, :, None] == jogos[:, None, :]).sum(axis=2)
+        ent = -np.log2(multiplicidade / 6).sum(axis=1) / 6
+        nota_ent = np.where((ent >= 2.0) & (ent <= 2.5), 100,
+                            np.where((ent >= 1.5) & (ent <= 2.8), 70, 40)) 
+
+        # 6. MONTE CARLO (10%) - Novo!
+        nota_mc = 0
+        if monte_carlo and self.motor.monte_carlo:
+            nota_mc = self.motor.monte_carlo.simular_lote(jogos, max(1, MC_ITERACOES_JOGO // 10))['score_mc'] 
+
+        final = (
+            np.minimum(nota_sinal, 100) * 0.40 +
+            nota_hist * 0.20 +
+            np.maximum(0, nota_corr) * 0.15 +
+            nota_bal * 0.10 +
+            nota_ent * 0.05 +
+            nota_mc * 0.10  # Monte Carlo weight
+        ) 
+
+        return np.minimum(final, 100.0) 
 
 # ================================================================================
 # GERADOR DE JOGOS COM CONVERGÊNCIA ACELERADA
 # ================================================================================ 
 
+def contexto_processos():
+    """
+    Contexto do multiprocessing: fork só no Linux (herda o estado sem cópia);
+    nos demais sistemas o método padrão da plataforma (spawn no macOS, onde
+    fork não é seguro com os frameworks do sistema, e no Windows)
+    """
+    if sys.platform.startswith('linux'):
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context() 
+
+# Estado do processo trabalhador: recebido uma única vez no início do pool
+# (herdado sem cópia via fork; serializado uma vez por processo nos demais casos)
+_GERADOR_TRABALHADOR: Optional['GeradorJogos'] = None 
+
+def _iniciar_trabalhador(gerador: 'GeradorJogos'):
+    global _GERADOR_TRABALHADOR
+    _GERADOR_TRABALHADOR = gerador 
+
+def _ranquear_letra_trabalhador(tarefa: Tuple) -> Tuple[List[JogoGerado], Dict]:
+    # Medições do trabalhador voltam junto com o ranking para somar no processo principal
+    PERFIL.reiniciar()
+    return _GERADOR_TRABALHADOR._ranquear_letra(*tarefa), PERFIL.extrair() 
+
 class GeradorJogos:
-    def __init__(self, motor: MotorDados, inercias: List[PosicaoRaiz],
-                 classificador: ClassificadorTermico, precisao: MotorPrecisao):
-        self.motor = motor
-        self.inercias = inercias
-        self.classificador = classificador
-        self.precisao = precisao
-        self.dnas_usados: Set[str] = set()
-        self.pool_elite: List[List[int]] = [[] for _ in range(6)] 
-
-    def gerar(self, quantidade: int = 7) -> List[JogoGerado]:
-        jogos = []
-        letras = ['A', 'B', 'C', 'D', 'E', 'F', 'G'] 
-
-        for i in range(min(quantidade, len(letras))):
-            jogo = self._gerar_jogo_mc(letras[i])
-            if jogo:
-                jogos.append(jogo)
-                self.dnas_usados.add(jogo.dna) 
-
-        # Ordena por precisão (agora inclui Monte Carlo)
-        jogos.sort(key=lambda x: x.precisao, reverse=True) 
-
-        for i in range(6):
-            elites = [j.dezenas[i] for j in jogos[:3] if j.status_detalhado[i] == "(+)"]
-            self.pool_elite[i] = elites if elites else [j.dezenas[i] for j in jogos[:1]] 
-
-        return jogos 
-
-    def _gerar_jogo_mc(self, letra: str) -> Optional[JogoGerado]:
-        """Gera jogo usando convergência acelerada de Monte Carlo"""
-        melhor_jogo = None
-        melhor_score = 0 
-
-        # Fase 1: Exploração (diversidade)
-        candidatos = []
-        for _ in range(100):
-            dezenas = self._estrategia_hibrida_mc()
-            if len(set(dezenas)) == 6:
-                jogo = self._construir_jogo(letra, dezenas)
-                if jogo.dna not in self.dnas_usados:
-                    candidatos.append(jogo) 
-
-        # Fase 2: Convergência (refinamento Monte Carlo)
-        for jogo in candidatos[:20]:  # Top 20 candidatos
-            if self.motor.monte_carlo:
-                resultado_mc = self.motor.monte_carlo.simular_jogo_completo(
-                    jogo.dezenas, MC_ITERACOES_JOGO // 50
-                )
-                score_total = jogo.precisao * 0.7 + resultado_mc['score_mc'] * 0.3 
-
-                if score_total > melhor_score:
-                    melhor_score = score_total
-                    melhor_jogo = jogo
-                    melhor_jogo.mc_score = resultado_mc['score_mc']
-                    melhor_jogo.mc_convergencia = resultado_mc['confianca']
-                    melhor_jogo.mc_variancia = resultado_mc['variancia'] 
-
-        return melhor_jogo or (candidatos[0] if candidatos else None) 
-
-    def _estrategia_hibrida_mc(self) -> List[int]:
-        """Estratégia híbrida com peso Monte Carlo"""
-        jogo = [] 
-
-        for i, inc in enumerate(self.inercias):
-            # Usa distribuição MC se disponível
-            if inc.mc_distribuicao and random.random() < 0.3:
-                # Amostra da distribuição Monte Carlo
-                raizes_possiveis = list(inc.mc_distribuicao.keys())
-                pesos_mc = list(inc.mc_distribuicao.values())
-                raiz = random.choices(raizes_possiveis, weights=pesos_mc, k=1)[0]
-                # Converte de float para int (raiz)
-                raiz = int(float(raiz)) % 9 + 1
-            else:               dezenas.append(random.randint(1, 60)) 
-
-        unicas = list(set(dezenas))
-        while len(unicas) < 6:
-            n = random.randint(1, 60)
-            if n not in unicas:
-                unicas.append(n) 
-
-        unicas = self._otimizar_raizes_mc(unicas[:6]) 
-
-        jogo = self._construir_jogo("H", unicas) 
-
-        # Refinamento Monte Carlo final no Jogo H
-        if self.motor.monte_carlo:
-            resultado_mc = self.motor.monte_carlo.simular_jogo_completo(unicas, MC_ITERACOES_JOGO // 20)
-            jogo.precisao = min(jogo.precisao * 0.8 + resultado_mc['score_mc'] * 0.2 + 5, 100)
-            jogo.mc_score = resultado_mc['score_mc'] 
-
-        return jogo 
-
-    def _otimizar_raizes_mc(self, dezenas: List[int]) -> List[int]:
-        dezenas = list(dezenas)
-        for i in range(6):
-            raiz_ideal = self.inercias[i].raiz_dominante
-            raiz_atual = calcular_raiz(dezenas[i]) 
-
-            if raiz_atual != raiz_ideal:
-                candidatas = [d for d in self.motor.get_dezenas_raiz(raiz_ideal) if d not in dezenas]
-                if candidatas:
-                    # Escolhe a que tem melhor score MC
-                    melhor = max(candidatas, key=lambda x: self.motor.get_analytics(x).mc_confianca
-                                if self.motor.get_analytics(x) else 0)
-                    dezenas[i] = melhor
-        return dezenas 
+    LETRAS = ['A', 'B', 'C', 'D', 'E', 'F', 'G'] 
+
+    def __init__(self, motor: MotorDados, inercias: List[PosicaoRaiz],
+                 classificador: ClassificadorTermico, precisao: MotorPrecisao,
+                 semente: Optional[int] = None, candidatos: Optional[int] = None):
+        self.motor = motor
+        # Candidatos amostrados por letra (padrão CANDIDATOS_POR_LETRA)
+        self.candidatos = CANDIDATOS_POR_LETRA if candidatos is None else max(1, candidatos)
+        self.inercias = inercias
+        self.classificador = classificador
+        self.precisao = precisao
+        self.chaves_usadas: Set[int] = set()  # Máscaras de 60 bits dos jogos já escolhidos
+        self.pool_elite: List[List[int]] = [[] for _ in range(6)]
+        # Semente mestra: cada letra (e o jogo H) recebe um fluxo derivado próprio
+        self.aleatorio = random.Random()
+        self.rng = np.random.default_rng()
+        self._tabelas_amostragem: Optional[Tuple] = None
+        self._sementes = np.random.SeedSequence(semente)
+        self._semente_mestre: Optional[np.random.SeedSequence] = None 
+
+    def _semear(self, semente: np.random.SeedSequence):
+        """Reinicia os geradores (Python e Monte Carlo) a partir de um fluxo derivado"""
+        self.aleatorio.seed(int.from_bytes(semente.generate_state(4).tobytes(), 'little'))
+        self.rng = np.random.default_rng(semente.spawn(1)[0])
+        if self.motor.monte_carlo:
+            self.motor.monte_carlo.rng = np.random.default_rng(semente) 
+
+    def gerar(self, quantidade: int = 7, processos: int = 1) -> List[JogoGerado]:
+        """
+        Gera os jogos A-G. Com processos > 1 as letras são ranqueadas em paralelo;
+        o resultado é o mesmo da execução serial para a mesma semente
+        """
+        for evento in self.gerar_fluxo(quantidade, processos):
+            if isinstance(evento, ResumoGeracao):
+                return evento.ranking
+        return [] 
+
+    def gerar_fluxo(self, quantidade: int = 7, processos: int = 1) -> Iterator:
+        """
+        Versão em fluxo de gerar(): entrega cada JogoGerado assim que a letra é
+        refinada (na ordem das letras, exigida pela deduplicação) e, no fim, um
+        ResumoGeracao com o ranking e o pool de elite
+        """
+        jogos = []
+        letras = self.LETRAS[:quantidade]
+        sementes = self._sementes.spawn(len(self.LETRAS) + 1)
+        self._semente_mestre = sementes[-1]
+        excluir = frozenset(self.chaves_usadas)
+        tarefas = [(letra, semente, excluir) for letra, semente in zip(letras, sementes)] 
+
+        # Deduplicação pela chave na ordem das letras: cada uma fica com o melhor jogo ainda livre
+        for ranking in self._rankings(tarefas, processos):
+            jogo = next((j for j in ranking if j.chave not in self.chaves_usadas), None)
+            PERFIL.contar('rejeitados_dna', ranking.index(jogo) if jogo else len(ranking))
+            if jogo:
+                jogos.append(jogo)
+                self.chaves_usadas.add(jogo.chave)
+                yield jogo 
+
+        # Ordena por precisão (agora inclui Monte Carlo)
+        jogos.sort(key=lambda x: x.precisao, reverse=True) 
+
+        for i in range(6):
+            elites = [j.dezenas[i] for j in jogos[:3] if j.status_detalhado[i] == "(+)"]
+            self.pool_elite[i] = elites if elites else [j.dezenas[i] for j in jogos[:1]] 
+
+        yield ResumoGeracao(ranking=jogos, pool_elite=[list(p) for p in self.pool_elite]) 
+
+    def _rankings(self, tarefas: List[Tuple], processos: int) -> Iterator[List[JogoGerado]]:
+        """Rankings por letra, em ordem, à medida que ficam prontos (serial ou em pool)"""
+        if processos > 1 and len(tarefas) > 1:
+            with contexto_processos().Pool(min(processos, len(tarefas)), initializer=_iniciar_trabalhador,
+                               initargs=(self,)) as pool:
+                for ranking, medicoes in pool.imap(_ranquear_letra_trabalhador, tarefas):
+                    PERFIL.combinar(medicoes)
+                    yield ranking
+        else:
+            for tarefa in tarefas:
+                yield self._ranquear_letra(*tarefa) 
+
+    def _gerar_jogo_mc(self, letra: str) -> Optional[JogoGerado]:
+        """Gera jogo usando convergência acelerada de Monte Carlo"""
+        ranking = self._ranquear_letra(letra, self._sementes.spawn(1)[0], frozenset(self.chaves_usadas))
+        return ranking[0] if ranking else None 
+
+    def _ranquear_letra(self, letra: str, semente: np.random.SeedSequence,
+                        excluir: frozenset) -> List[JogoGerado]:
+        """Candidatos refinados da letra, do melhor para o pior score total"""
+        self._semear(semente) 
+
+        # Fase 1: Exploração (diversidade) - lotes vetorizados, só os melhores viram objetos
+        with PERFIL.etapa('candidatos'):
+            melhores = self._selecionar_candidatos(self.candidatos, TOP_K_REFINAMENTO, excluir)
+            candidatos = [self._construir_jogo(letra, dezenas) for dezenas in melhores.tolist()] 
+
+        if not self.motor.monte_carlo:
+            return candidatos 
+
+        # Fase 2: Convergência (refinamento Monte Carlo)
+        refinados = []
+        with PERFIL.etapa('refinamento_mc'):
+            for jogo in candidatos:  # Top K candidatos
+                resultado_mc = self.motor.monte_carlo.simular_jogo_completo(
+                    jogo.dezenas, max(1, MC_ITERACOES_JOGO // 50)
+                )
+                jogo.mc_score = resultado_mc['score_mc']
+                jogo.mc_convergencia = resultado_mc['confianca']
+                jogo.mc_variancia = resultado_mc['variancia']
+                refinados.append((jogo.precisao * 0.7 + resultado_mc['score_mc'] * 0.3, jogo)) 
+
+        # Ordenação estável: empates mantêm a ordem de geração (como antes)
+        refinados.sort(key=lambda x: x[0], reverse=True)
+        return [jogo for _, jogo in refinados] 
+
+    def _selecionar_candidatos(self, quantidade: int, k: int,
+                               excluir: frozenset = frozenset()) -> np.ndarray:
+        """
+        Amostra `quantidade` candidatos em lotes e mantém só os k melhores pela
+        precisão sem Monte Carlo: jogos com dezena repetida ou com chave em
+        `excluir` são descartados e jogos com o mesmo conjunto (mesma chave)
+        ficam só na melhor ordem. Empates seguem a ordem de geração. Retorna (≤k)×6
+        """
+        chaves_excluidas = np.array(sorted(excluir), dtype=np.uint64)
+        topo = np.zeros((0, 6), dtype=np.int64)
+        topo_score = np.zeros(0)
+        topo_ordem = np.zeros(0, dtype=np.int64)
+        gerados = 0
+        while gerados < quantidade:
+            m = min(LOTE_CANDIDATOS, quantidade - gerados)
+            jogos = self._amostrar_candidatos(m)
+            ordem = np.arange(gerados, gerados + m)
+            gerados += m 
+
+            mascaras = np.bitwise_or.reduce(MASCARA_DEZENA[jogos], axis=1)
+            validos = contar_bits(mascaras) == 6
+            PERFIL.contar('rejeitados_repetidos', int(m - np.count_nonzero(validos)))
+            if len(chaves_excluidas):
+                livres = ~np.isin(mascaras, chaves_excluidas)
+                PERFIL.contar('rejeitados_dna', int(np.count_nonzero(validos & ~livres)))
+                validos &= livres
+            jogos, ordem = jogos[validos], ordem[validos]
+            scores = self.precisao.calcular_lote(jogos, self.inercias, monte_carlo=False) 
+
+            # Junta com o topo atual, um representante por conjunto, e corta em k
+            jogos = np.concatenate([topo, jogos])
+            scores = np.concatenate([topo_score, scores])
+            ordem = np.concatenate([topo_ordem, ordem])
+            ranking = np.lexsort((ordem, -scores))
+            _, primeiros = np.unique(np.bitwise_or.reduce(MASCARA_DEZENA[jogos[ranking]], axis=1),
+                                     return_index=True)
+            escolhidos = ranking[np.sort(primeiros)[:k]]
+            topo, topo_score, topo_ordem = jogos[escolhidos], scores[escolhidos], ordem[escolhidos] 
+
+        PERFIL.contar('candidatos_gerados', gerados)
+        return topo 
+
+    def _amostrar_candidatos(self, m: int) -> np.ndarray:
+        """
+        _estrategia_hibrida_mc para m jogos de uma vez: por posição, raiz da
+        distribuição MC (30%) ou dominante, e dezena da raiz ponderada pela
+        probabilidade de saída, sem repetir as já escolhidas no jogo
+        """
+        dezenas_raiz, pesos_raiz, raizes_mc = self._tabelas()
+        jogos = np.zeros((m, 6), dtype=np.int64)
+        linhas = np.arange(m)
+        for i, inc in enumerate(self.inercias):
+            raiz = np.full(m, inc.raiz_dominante, dtype=np.int64)
+            if raizes_mc[i] is not None:
+                valores, acumulado = raizes_mc[i]
+                usa_mc = self.rng.random(m) < 0.3
+                sorteio = np.searchsorted(acumulado, self.rng.random(m) * acumulado[-1], side='right')
+                raiz = np.where(usa_mc, valores[np.minimum(sorteio, len(valores) - 1)], raiz) 
+
+            candidatas = dezenas_raiz[raiz]
+            pesos = pesos_raiz[raiz]
+            for j in range(i):
+                pesos = np.where(candidatas == jogos[:, j:j + 1], 0.0, pesos)
+            acumulado = pesos.cumsum(axis=1)
+            alvo = self.rng.random(m) * acumulado[:, -1]
+            escolha = np.minimum((acumulado <= alvo[:, None]).sum(axis=1), candidatas.shape[1] - 1)
+            jogos[:, i] = np.where(acumulado[:, -1] > 0, candidatas[linhas, escolha],
+                                   self.rng.integers(1, 61, m))
+        return jogos 
+
+    def _tabelas(self) -> Tuple:
+        """Dezenas e pesos por raiz (10×7, completadas com peso 0) e distribuições MC por posição"""
+        if self._tabelas_amostragem is None or self._tabelas_amostragem[0] != self.motor.versao:
+            dezenas_raiz = np.zeros((10, 7), dtype=np.int64)
+            pesos_raiz = np.zeros((10, 7))
+            for raiz in range(1, 10):
+                for c, d in enumerate(self.motor.get_dezenas_raiz(raiz)):
+                    analytics = self.motor.get_analytics(d)
+                    dezenas_raiz[raiz, c] = d
+                    pesos_raiz[raiz, c] = max(analytics.probabilidade_saida, 1.0) if analytics else 1.0
+            raizes_mc = []
+            for inc in self.inercias:
+                if inc.mc_distribuicao:
+                    # Mesma conversão de _estrategia_hibrida_mc: chave (float) -> raiz
+                    valores = np.array([int(float(r)) % 9 + 1 for r in inc.mc_distribuicao], dtype=np.int64)
+                    raizes_mc.append((valores, np.cumsum(list(inc.mc_distribuicao.values()))))
+                else:
+                    raizes_mc.append(None)
+            self._tabelas_amostragem = (self.motor.versao, dezenas_raiz, pesos_raiz, raizes_mc)
+        return self._tabelas_amostragem[1:] 
+
+    def _estrategia_hibrida_mc(self) -> List[int]:
+        """Estratégia híbrida com peso Monte Carlo"""
+        jogo = [] 
+
+        for i, inc in enumerate(self.inercias):
+            # Usa distribuição MC se disponível
+            if inc.mc_distribuicao and self.aleatorio.random() < 0.3:
+                # Amostra da distribuição Monte Carlo
+                raizes_possiveis = list(inc.mc_distribuicao.keys())
+                pesos_mc = list(inc.mc_distribuicao.values())
+                raiz = self.aleatorio.choices(raizes_possiveis, weights=pesos_mc, k=1)[0]
+                # Converte de float para int (raiz)
+                raiz = int(float(raiz)) % 9 + 1
+            else:
+                raiz = inc.raiz_dominante 
+
+            # Escolhe a dezena da raiz ponderando pela probabilidade de saída
+            candidatas = [d for d in self.motor.get_dezenas_raiz(raiz) if d not in jogo]
+            if candidatas:
+                pesos = [max(self.motor.get_analytics(d).probabilidade_saida, 1.0)
+                         if self.motor.get_analytics(d) else 1.0 for d in candidatas]
+                jogo.append(self.aleatorio.choices(candidatas, weights=pesos, k=1)[0])
+            else:
+                jogo.append(self.aleatorio.randint(1, 60)) 
+
+        return jogo 
+
+    def _construir_jogo(self, letra: str, dezenas: List[int]) -> JogoGerado:
+        status = [self.classificador.classificar(d, i, self.inercias[i])['status']
+                  for i, d in enumerate(dezenas)]
+        return JogoGerado(
+            letra=letra,
+            dezenas=list(dezenas),
+            raizes=[calcular_raiz(d) for d in dezenas],
+            precisao=self.precisao.calcular(dezenas, self.inercias),
+            status_detalhado=status
+        ) 
+
+    def gerar_mestre(self) -> JogoGerado:
+        """Jogo H: convergência mestra a partir do pool de elite"""
+        self._semear(self._semente_mestre or self._sementes.spawn(1)[0])
+        dezenas = []
+        for i in range(6):
+            if self.pool_elite[i]:
+                dezenas.append(Counter(self.pool_elite[i]).most_common(1)[0][0])
+            else:
+                dezenas.append(self.aleatorio.randint(1, 60)) 
+
+        unicas = list(set(dezenas))
+        while len(unicas) < 6:
+            n = self.aleatorio.randint(1, 60)
+            if n not in unicas:
+                unicas.append(n) 
+
+        unicas = self._otimizar_raizes_mc(unicas[:6]) 
+
+        jogo = self._construir_jogo("H", unicas) 
+
+        # Refinamento Monte Carlo final no Jogo H
+        if self.motor.monte_carlo:
+            resultado_mc = self.motor.monte_carlo.simular_jogo_completo(unicas, max(1, MC_ITERACOES_JOGO // 20))
+            jogo.precisao = min(jogo.precisao * 0.8 + resultado_mc['score_mc'] * 0.2 + 5, 100)
+            jogo.mc_score = resultado_mc['score_mc'] 
+
+        return jogo 
+
+    def _otimizar_raizes_mc(self, dezenas: List[int]) -> List[int]:
+        dezenas = list(dezenas)
+        for i in range(6):
+            raiz_ideal = self.inercias[i].raiz_dominante
+            raiz_atual = calcular_raiz(dezenas[i]) 
+
+            if raiz_atual != raiz_ideal:
+                candidatas = [d for d in self.motor.get_dezenas_raiz(raiz_ideal) if d not in dezenas]
+                if candidatas:
+                    # Escolhe a que tem melhor score MC
+                    melhor = max(candidatas, key=lambda x: self.motor.get_analytics(x).mc_confianca
+                                if self.motor.get_analytics(x) else 0)
+                    dezenas[i] = melhor
+        return dezenas 
 
 # ================================================================================
-# INTERFACE VISUAL (INTACTA - NÃO MODIFICADA)
+# BACKTEST WALK-FORWARD
 # ================================================================================ 
 
-def limpar_tela():
-    os.system('clear' if os.name == 'posix' else 'cls') 
-
-def print_header(titulo: str):
-    print(f"{COR_AZUL}{'█' * 75}{COR_RESET}")
-    print(f"{COR_VERDE}{COR_NEGRITO}{titulo.center(75)}{COR_RESET}")
-    print(f"{COR_AZUL}{'█' * 75}{COR_RESET}") 
-
-def print_linha(char: str = "═"):
-    print(f"{COR_CIANO}{char * 75}{COR_RESET}") 
-
-def formatar_dezena(dezena: int, status: str) -> str:
-    cores = {
-        "(+)": COR_VERDE,
-        "(-)": COR_VERMELHO,
-        "(!)": COR_AMARELO,
-        "(/)": COR_CIANO,
-        "(?)": COR_BRANCO
-    }
-    return f"{cores.get(status, COR_BRANCO)}{dezena:02d}{status}{COR_RESET}" 
-
-def print_jogo(jogo: JogoGerado, inercias: List[PosicaoRaiz]):
-    partes = [formatar_dezena(d, s) for d, s in zip(jogo.dezenas, jogo.status_detalhado)]
-    print(f"  [{COR_NEGRITO}{jogo.letra}{COR_RESET}] " + " ".join(partes) +
-          f"  | Prec: {COR_VERDE}{jogo.precisao:.1f}%{COR_RESET}") 
+ETAPAS_BACKTEST = ('estado', 'inercia', 'geracao', 'mestre', 'avaliacao') 
 
-def print_elite(jogos: List[JogoGerado], inercias: List[PosicaoRaiz], proximo: int):
-    print_linha("◆")
-    print(f"{COR_AMARELO}{COR_NEGRITO}  >>> ELITE NEURAL SCANNER: CONCURSO {proximo}{COR_RESET}")
-    print_linha("◆") 
+@dataclass
+class ResultadoBacktest:
+    passos: int = 0
+    # Histograma de acertos (0..6) por letra (A-G, H) e no total
+    histogramas: Dict[str, List[int]] = field(default_factory=dict)
+    tempos: Dict[str, float] = field(default_factory=lambda: {e: 0.0 for e in ETAPAS_BACKTEST})
+    registros: List[Dict] = field(default_factory=list) 
+
+    def registrar(self, concurso: int, acertos: Dict[str, int]):
+        self.passos += 1
+        self.registros.append({'concurso': concurso, 'acertos': acertos})
+        for letra, h in itertools.chain(acertos.items(), (('total', h) for h in acertos.values())):
+            self.histogramas.setdefault(letra, [0] * 7)[h] += 1 
+
+    def combinar(self, outro: 'ResultadoBacktest'):
+        """Junta um trecho posterior (execução paralela) a este resultado"""
+        self.passos += outro.passos
+        self.registros.extend(outro.registros)
+        for letra, hist in outro.histogramas.items():
+            atual = self.histogramas.setdefault(letra, [0] * 7)
+            self.histogramas[letra] = [a + b for a, b in zip(atual, hist)]
+        for etapa, segundos in outro.tempos.items():
+            self.tempos[etapa] = self.tempos.get(etapa, 0.0) + segundos 
+
+    def media_acertos(self, letra: str = 'total') -> float:
+        hist = self.histogramas.get(letra, [0] * 7)
+        return sum(h * n for h, n in enumerate(hist)) / max(sum(hist), 1) 
+
+# Histórico completo compartilhado com os trabalhadores do backtest
+_BACKTEST_TRABALHADOR: Optional[Tuple] = None 
+
+def _iniciar_backtest(dados: Tuple):
+    global _BACKTEST_TRABALHADOR
+    _BACKTEST_TRABALHADOR = dados 
+
+def _backtest_trabalhador(trecho: Tuple[int, int]) -> ResultadoBacktest:
+    return _executar_trecho(*_BACKTEST_TRABALHADOR, *trecho) 
+
+def _executar_trecho(concursos: np.ndarray, dezenas: np.ndarray, mascaras: np.ndarray,
+                     entropia: int, quantidade: int, candidatos: Optional[int],
+                     inicio: int, fim: int) -> ResultadoBacktest:
+    """
+    Passos t em [inicio, fim): estado com os sorteios [0, t), jogos A-G e H,
+    acertos contra o sorteio t. O estado avança com adicionar_concurso
+    """
+    resultado = ResultadoBacktest()
+    tempos = resultado.tempos
+    motor = MotorDados()
+    analisador = AnalisadorInercia(motor)
+    classificador = ClassificadorTermico(motor)
+    precisao = MotorPrecisao(motor, classificador) 
+
+    for t in range(inicio, fim):
+        # Cada passo tem sementes próprias: o resultado não depende de como os passos são repartidos
+        semente_mc, semente_jogos = np.random.SeedSequence(entropia, spawn_key=(t,)).spawn(2) 
+
+        t0 = time.perf_counter()
+        if t == inicio:
+            # Estado inicial construído uma única vez, já com a semente do passo
+            motor.carregar_sorteios(concursos[:inicio], dezenas[:inicio], semente=semente_mc)
+        else:
+            motor.monte_carlo.rng = np.random.default_rng(semente_mc)
+            motor.adicionar_concurso(dezenas[t - 1].tolist(), int(concursos[t - 1]))
+        t1 = time.perf_counter()
+        inercias = analisador.analisar()
+        t2 = time.perf_counter()
+        gerador = GeradorJogos(motor, inercias, classificador, precisao,
+                               semente=int(semente_jogos.generate_state(1, np.uint64)[0]),
+                               candidatos=candidatos)
+        jogos = gerador.gerar(quantidade)
+        t3 = time.perf_counter()
+        jogos.append(gerador.gerar_mestre())
+        t4 = time.perf_counter()
+        sorteio = int(mascaras[t])
+        resultado.registrar(int(concursos[t]), {j.letra: bin(mascara_jogo(j.dezenas) & sorteio).count('1')
+                                                for j in jogos})
+        t5 = time.perf_counter() 
+
+        for etapa, segundos in zip(ETAPAS_BACKTEST, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4)):
+            tempos[etapa] += segundos
+    return resultado 
+
+def executar_backtest(motor: MotorDados, inicio: int = 50, fim: Optional[int] = None,
+                      semente: Optional[int] = None, quantidade: int = 7,
+                      processos: int = 1, candidatos: Optional[int] = None) -> ResultadoBacktest:
+    """
+    Walk-forward sobre o histórico carregado em `motor`: para cada concurso t em
+    [inicio, fim) gera os jogos com os sorteios anteriores e conta os acertos em t.
+    Com processos > 1 os passos são divididos em trechos contíguos, um por processo
+    (cada trecho reconstrói o estado uma vez); o resultado é o mesmo do serial.
+    `candidatos` limita a amostragem por letra em cada passo (padrão CANDIDATOS_POR_LETRA)
+    """
+    h = motor.historico
+    fim = len(h) if fim is None else min(fim, len(h))
+    inicio = max(1, inicio)
+    dados = (np.array(h.concursos), np.array(h.dezenas), np.array(h.mascaras),
+             np.random.SeedSequence(semente).entropy, quantidade, candidatos)
+    if inicio >= fim:
+        return ResultadoBacktest() 
+
+    processos = max(1, min(processos, fim - inicio))
+    cortes = np.linspace(inicio, fim, processos + 1).astype(int).tolist()
+    trechos = list(zip(cortes[:-1], cortes[1:])) 
+
+    if processos > 1:
+        with contexto_processos().Pool(processos, initializer=_iniciar_backtest, initargs=(dados,)) as pool:
+            parciais = pool.map(_backtest_trabalhador, trechos)
+    else:
+        parciais = [_executar_trecho(*dados, *trecho) for trecho in trechos] 
+
+    resultado = parciais[0]
+    for parcial in parciais[1:]:
+        resultado.combinar(parcial)
+    return resultado 
 
-    for rank, jogo in enumerate(jogos[:3], 1):
-        icone = "🔥🔥🔥 ULTRA" if jogo.precisao > 90 else "🔥🔥 PREMIUM" if jogo.precisao > 80 else "🔥 HOT" if jogo.precisao > 70 else "⭐ STD"
-        cor = COR_VERMELHO if jogo.precisao > 90 else COR_VERDE if jogo.precisao > 80 else COR_AMARELO 
+# ================================================================================
+# EXECUÇÃO EM LOTE (SEM TERMINAL)
+# ================================================================================ 
 
-        print(f"\n  {cor}{COR_NEGRITO}[RANK {rank}] JOGO {jogo.letra} ({jogo.precisao:.2f}% {icone}){COR_RESET}")
-        print(f"  {'─' * 50}") 
+CAMPOS_LOTE = ['scan', 'semente', 'concursos', 'letra', 'dezenas', 'raizes', 'precisao', 'mc_score',
+               'mc_convergencia', 'mc_variancia', 'status', 'dna'] 
+
+def _inteiro_positivo(texto: str) -> int:
+    """Tipo do argparse: inteiro >= 1"""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"inteiro inválido: {texto!r}")
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"deve ser >= 1 (recebido {valor})")
+    return valor 
+
+def configurar_iteracoes(raiz: Optional[int] = None, jogo: Optional[int] = None):
+    """Ajusta o orçamento Monte Carlo do processo (vale também para o snapshot)"""
+    global MC_ITERACOES_RAIZ, MC_ITERACOES_JOGO
+    for nome, valor in (('raiz', raiz), ('jogo', jogo)):
+        if valor is not None and valor < 1:
+            raise ValueError(f"iterações por {nome} devem ser >= 1 (recebido {valor})")
+    if raiz is not None:
+        MC_ITERACOES_RAIZ = raiz
+    if jogo is not None:
+        MC_ITERACOES_JOGO = jogo 
+
+def _registro_lote(scan: int, semente: int, concursos: int, jogo: JogoGerado) -> Dict:
+    return {
+        'scan': scan, 'semente': semente, 'concursos': concursos, 'letra': jogo.letra,
+        'dezenas': jogo.dezenas, 'raizes': jogo.raizes, 'precisao': round(jogo.precisao, 4),
+        'mc_score': round(jogo.mc_score, 4), 'mc_convergencia': round(jogo.mc_convergencia, 6),
+        'mc_variancia': round(jogo.mc_variancia, 6), 'status': jogo.status_detalhado, 'dna': jogo.dna
+    } 
+
+def executar_lote(motor: MotorDados, scans: int, semente: Optional[int] = None,
+                  processos: int = 1, perfil: Optional[str] = None, candidatos: Optional[int] = None):
+    """
+    Gera `scans` conjuntos A-G + H sobre o mesmo estado carregado, um registro
+    por jogo. Cada scan tem semente própria derivada da semente do lote
+    """
+    raiz = np.random.SeedSequence(semente)
+    if semente is not None:
+        # Analytics e inércias reproduzíveis (o carregamento usa um gerador sem semente)
+        motor.resemear(raiz.spawn(1)[0])
+    inercias = AnalisadorInercia(motor).analisar()
+    classificador = ClassificadorTermico(motor)
+    precisao = MotorPrecisao(motor, classificador)
+    total = len(motor.historico) 
+
+    for scan, filha in enumerate(raiz.spawn(scans)):
+        semente_scan = int(filha.generate_state(1, np.uint64)[0])
+        if perfil:
+            PERFIL.reiniciar()
+            PERFIL.ativo = True
+        inicio = time.perf_counter()
+        with PERFIL.etapa('geracao'):
+            gerador = GeradorJogos(motor, inercias, classificador, precisao, semente=semente_scan,
+                                   candidatos=candidatos)
+            jogos = gerador.gerar(7, processos=processos)
+        with PERFIL.etapa('mestre'):
+            jogos.append(gerador.gerar_mestre())
+        if perfil:
+            PERFIL.ativo = False
+            with open(perfil, 'a', encoding='utf-8') as f:
+                relatorio = PERFIL.relatorio(scan=scan, segundos=round(time.perf_counter() - inicio, 6))
+                f.write(json.dumps(relatorio, ensure_ascii=False) + '\n')
+        for jogo in jogos:
+            yield _registro_lote(scan, semente_scan, total, jogo) 
+
+CAMPOS_BACKTEST = ['tipo', 'chave', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'total'] 
+
+def escrever_backtest(resultado: ResultadoBacktest, saida, formato: str = 'jsonl', **extras):
+    """
+    Passos, histogramas e tempos do backtest. jsonl: uma linha por passo e uma
+    de resumo no fim; csv: linhas 'passo' (acertos por letra), 'histograma'
+    (chave = acertos, colunas = quantidade) e 'tempo' (segundos em total)
+    """
+    if formato == 'csv':
+        escritor = csv.DictWriter(saida, fieldnames=CAMPOS_BACKTEST)
+        escritor.writeheader()
+        for r in resultado.registros:
+            escritor.writerow({'tipo': 'passo', 'chave': r['concurso'], **r['acertos'],
+                               'total': sum(r['acertos'].values())})
+        for h in range(7):
+            escritor.writerow({'tipo': 'histograma', 'chave': h,
+                               **{letra: hist[h] for letra, hist in resultado.histogramas.items()}})
+        for etapa, segundos in resultado.tempos.items():
+            escritor.writerow({'tipo': 'tempo', 'chave': etapa, 'total': round(segundos, 6)})
+        return 
+
+    for r in resultado.registros:
+        saida.write(json.dumps({'tipo': 'passo', **r}, ensure_ascii=False) + '\n')
+    resumo = {
+        'tipo': 'resumo', **extras, 'passos': resultado.passos,
+        'histogramas': resultado.histogramas,
+        'media_acertos': {letra: round(resultado.media_acertos(letra), 6) for letra in resultado.histogramas},
+        'tempos': {etapa: round(segundos, 6) for etapa, segundos in resultado.tempos.items()}
+    }
+    saida.write(json.dumps(resumo, ensure_ascii=False) + '\n') 
+
+def main_lote(argv: Optional[List[str]] = None) -> int:
+    """Entrada não interativa: sem chave, sem limpar tela, sem cores"""
+    parser = argparse.ArgumentParser(prog='motor.py', description="Motor Z9 em lote (sem terminal)")
+    parser.add_argument('--scans', type=int, default=1, help="quantidade de scans")
+    parser.add_argument('--semente', type=int, default=None, help="semente do lote (reprodutível)")
+    parser.add_argument('--dados', default=ARQUIVO_DADOS, help="arquivo de concursos")
+    parser.add_argument('--iteracoes', type=_inteiro_positivo, default=None, help="iterações MC por jogo")
+    parser.add_argument('--iteracoes-raiz', type=_inteiro_positivo, default=None, help="iterações MC por raiz")
+    parser.add_argument('--formato', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--saida', default='-', help="arquivo de saída ('-' = stdout)")
+    parser.add_argument('--processos', type=_inteiro_positivo, default=1,
+                        help="processos em paralelo (letras por scan; trechos no backtest)")
+    parser.add_argument('--sem-snapshot', action='store_true', help="ignora o snapshot em disco")
+    parser.add_argument('--candidatos', type=_inteiro_positivo, default=None,
+                        help=f"candidatos amostrados por letra (padrão {CANDIDATOS_POR_LETRA})")
+    parser.add_argument('--exato', action='store_true',
+                        help="distribuição exata de acertos nos jogos (sem amostragem)")
+    parser.add_argument('--perfil', default=os.environ.get(ENV_PERFIL), help="relatório JSONL por scan")
+    parser.add_argument('--converter', metavar='DESTINO', nargs='?', const='',
+                        help="converte --dados para o histórico binário e sai (padrão: <dados>.z9hist)")
+    parser.add_argument('--backtest', action='store_true',
+                        help="walk-forward: joga cada concurso em [--inicio, --fim) só com os anteriores")
+    parser.add_argument('--inicio', type=int, default=50, help="primeiro concurso (índice) do backtest")
+    parser.add_argument('--fim', type=int, default=None, help="fim exclusivo do backtest (padrão: todos)")
+    args = parser.parse_args(argv) 
+
+    if args.converter is not None:
+        if not os.path.exists(args.dados):
+            print(f"ERRO: {args.dados} não encontrado!", file=sys.stderr)
+            return 1
+        destino = args.converter or args.dados + SUFIXO_HISTORICO
+        leitor = converter_historico(args.dados, destino)
+        for linha, motivo in leitor.rejeitadas:
+            print(f"{args.dados}:{linha}: linha recusada ({motivo})", file=sys.stderr)
+        print(f"{destino}: {leitor.aceitas} concursos", file=sys.stderr)
+        return 0 
+
+    configurar_iteracoes(args.iteracoes_raiz, args.iteracoes)
+    motor = MotorDados(exato=True if args.exato else None)
+    if not motor.carregar(args.dados, usar_snapshot=not args.sem_snapshot, verboso=False):
+        print(f"ERRO: {motor.erro}", file=sys.stderr)
+        return 1
+    for linha, motivo in motor.linhas_rejeitadas:
+        print(f"{args.dados}:{linha}: linha recusada ({motivo})", file=sys.stderr)
+    if motor.total_rejeitadas > len(motor.linhas_rejeitadas):
+        print(f"{args.dados}: {motor.total_rejeitadas} linhas recusadas no total", file=sys.stderr) 
+
+    try:
+        saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8', newline='')
+    except OSError as e:
+        print(f"ERRO: {e}", file=sys.stderr)
+        return 1
+    try:
+        if args.backtest:
+            inicio = time.perf_counter()
+            resultado = executar_backtest(motor, args.inicio, args.fim, args.semente,
+                                          processos=args.processos, candidatos=args.candidatos)
+            escrever_backtest(resultado, saida, args.formato, semente=args.semente, inicio=args.inicio,
+                              candidatos=args.candidatos or CANDIDATOS_POR_LETRA,
+                              fim=args.fim if args.fim is not None else len(motor.historico),
+                              segundos=round(time.perf_counter() - inicio, 6))
+            return 0
+        registros = executar_lote(motor, args.scans, args.semente, args.processos, args.perfil, args.candidatos)
+        if args.formato == 'csv':
+            escritor = csv.DictWriter(saida, fieldnames=CAMPOS_LOTE)
+            escritor.writeheader()
+            for r in registros:
+                escritor.writerow({**r, 'dezenas': '-'.join(map(str, r['dezenas'])),
+                                   'raizes': '-'.join(map(str, r['raizes'])), 'status': ' '.join(r['status'])})
+        else:
+            for r in registros:
+                saida.write(json.dumps(r, ensure_ascii=False) + '\n')
+        saida.flush()
+    except BrokenPipeError:
+        # Leitor fechou o pipe (ex.: `| head`): encerra em silêncio, sem traceback no flush final
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    return 0 
 
-        for i, d in enumerate(jogo.dezenas):
-            a = MotorDados().get_analytics(d)
-            info = f"    Bola {i+1}: {formatar_dezena(d, jogo.status_detalhado[i])}"
-            if a:
-                info += f" | Atraso: {a.atraso_atual} | Prob: {a.probabilidade_saida:.1f}%"
-            print(info) 
+# ================================================================================
+# SESSÃO (ESTADO QUENTE ENTRE SCANS)
+# ================================================================================ 
 
-def print_mestre(jogo: JogoGerado):
-    print_linha("█")
-    print(f"{COR_VERMELHO}{COR_NEGRITO}  >>> JOGO H (CONVERGÊNCIA MESTRA NEURAL){COR_RESET}")
-    print_linha("█")
-    dezenas_fmt = "  ".join(f"{COR_VERDE}{d:02d}(+){COR_RESET}" for d in jogo.dezenas)
-    print(f"\n  [{dezenas_fmt}]")
-    print(f"\n  {COR_AMARELO}Precisão Neural: {jogo.precisao:.2f}%{COR_RESET}")
-    print_linha("█") 
+class SessaoMotor:
+    """
+    Mantém motor, inércias, classificador e precisão carregados entre scans.
+    preparar() só recarrega se o arquivo mudou: mtime/tamanho iguais (e mesmos
+    parâmetros) reaproveitam direto; mtime diferente confere o hash do conteúdo
+    """ 
+
+    def __init__(self, arquivo: str = ARQUIVO_DADOS):
+        self.arquivo = arquivo
+        self.motor: Optional[MotorDados] = None
+        self.inercias: List[PosicaoRaiz] = []
+        self.classificador: Optional[ClassificadorTermico] = None
+        self.precisao: Optional[MotorPrecisao] = None
+        self._assinatura: Optional[Tuple] = None
+        self._chave: Optional[str] = None
+        # (assinatura, chave) calculados pela última valida() que precisou do hash
+        self._pendente: Optional[Tuple[Tuple, str]] = None
+        self.erro: Optional[str] = None 
+
+    def _assinatura_atual(self) -> Tuple:
+        estado = os.stat(self.arquivo)
+        return (estado.st_mtime_ns, estado.st_size, json.dumps(MotorDados.parametros_analise())) 
+
+    def valida(self) -> bool:
+        """True se o estado carregado ainda corresponde ao arquivo (hash no máximo uma vez por assinatura)"""
+        if self.motor is None or not os.path.exists(self.arquivo):
+            return False
+        assinatura = self._assinatura_atual()
+        if assinatura == self._assinatura:
+            return True
+        # Arquivo tocado (ex.: salvo de novo): só invalida se o conteúdo mudou
+        if self._pendente is None or self._pendente[0] != assinatura:
+            self._pendente = (assinatura, MotorDados.chave_snapshot(self.arquivo))
+        if self._pendente[1] == self._chave:
+            self._assinatura = assinatura
+            return True
+        return False 
+
+    def preparar(self, verboso: bool = True, valido: Optional[bool] = None) -> bool:
+        """
+        Garante o estado quente; retorna False se o carregamento falhar.
+        `valido` é o resultado de valida() já obtido nesta rodada (evita repetir)
+        """
+        if self.valida() if valido is None else valido:
+            return True 
+
+        motor = MotorDados()
+        if verboso:
+            print(f"{COR_CIANO}Carregando dados...{COR_RESET}")
+        with PERFIL.etapa('carregamento'):
+            # Assinatura e chave de antes da leitura: se o arquivo mudar durante
+            # o carregamento, a próxima valida() percebe e recarrega
+            assinatura, chave = None, None
+            if os.path.exists(self.arquivo):
+                assinatura = self._assinatura_atual()
+                if self._pendente and self._pendente[0] == assinatura:
+                    chave = self._pendente[1]
+            if not motor.carregar(self.arquivo, verboso=verboso, chave=chave):
+                self.motor = None
+                self.erro = motor.erro
+                return False
+        self.erro = None
+        with PERFIL.etapa('inercia'):
+            self.inercias = AnalisadorInercia(motor).analisar()
+        self.motor = motor
+        self.classificador = ClassificadorTermico(motor)
+        self.precisao = MotorPrecisao(motor, self.classificador)
+        self._assinatura = assinatura
+        self._chave = chave or motor.chave_carregada or MotorDados.chave_snapshot(self.arquivo)
+        self._pendente = None
+        return True 
+
+    def gerador(self, semente: Optional[int] = None) -> GeradorJogos:
+        """Gerador novo (sementes e deduplicação próprias) sobre o estado quente"""
+        return GeradorJogos(self.motor, self.inercias, self.classificador, self.precisao, semente=semente) 
 
 # ================================================================================
-# FUNÇÃO PRINCIPAL (INTACTA)
+# INTERFACE VISUAL (INTACTA - NÃO MODIFICADA)
 # ================================================================================ 
 
-def painel_principal():
-    motor = MotorDados() 
-
-    print(f"{COR_CIANO}Carregando dados...{COR_RESET}")
-    if not motor.carregar():
-        input("\nPressione ENTER para sair...")
-        return 
+LIMPAR_TELA = "\033[2J\033[H" 
 
-    total = len(motor.dados)
-    print(f"{COR_VERDE}✓ {total} concursos carregados{COR_RESET}\n") 
+@dataclass
+class RelatorioScan:
+    """Tudo o que o painel mostra, já calculado pelo scan (nenhum objeto do motor é recriado)"""
+    concursos: int
+    inercias: List[PosicaoRaiz]
+    jogos: List[JogoGerado]
+    mestre: Optional[JogoGerado] = None
+    analytics: Mapping[int, DezenaAnalytics] = field(default_factory=dict) 
+
+    @property
+    def proximo(self) -> int:
+        return self.concursos + 1 
+
+class RenderizadorTerminal:
+    """
+    Monta o relatório inteiro em memória e o escreve de uma vez (uma única
+    chamada write + flush). Com `cores=False` gera texto puro, sem ANSI
+    """ 
+
+    def __init__(self, cores: bool = True):
+        self.cores = cores
+        self.partes: List[str] = [] 
+
+    def cor(self, *codigos: str) -> str:
+        return ''.join(codigos) if self.cores else '' 
+
+    def linha_texto(self, texto: str = ""):
+        self.partes.append(texto + '\n') 
+
+    def limpar(self):
+        if self.cores:
+            self.partes.append(LIMPAR_TELA) 
+
+    def cabecalho(self, titulo: str):
+        azul, reset = self.cor(COR_AZUL), self.cor(COR_RESET)
+        self.linha_texto(f"{azul}{'█' * 75}{reset}")
+        self.linha_texto(f"{self.cor(COR_VERDE, COR_NEGRITO)}{titulo.center(75)}{reset}")
+        self.linha_texto(f"{azul}{'█' * 75}{reset}") 
+
+    def linha(self, char: str = "═"):
+        self.linha_texto(f"{self.cor(COR_CIANO)}{char * 75}{self.cor(COR_RESET)}") 
+
+    def dezena(self, dezena: int, status: str) -> str:
+        cores = {
+            "(+)": COR_VERDE,
+            "(-)": COR_VERMELHO,
+            "(!)": COR_AMARELO,
+            "(/)": COR_CIANO,
+            "(?)": COR_BRANCO
+        }
+        return f"{self.cor(cores.get(status, COR_BRANCO))}{dezena:02d}{status}{self.cor(COR_RESET)}" 
+
+    def jogo(self, jogo: JogoGerado):
+        partes = [self.dezena(d, s) for d, s in zip(jogo.dezenas, jogo.status_detalhado)]
+        self.linha_texto(f"  [{self.cor(COR_NEGRITO)}{jogo.letra}{self.cor(COR_RESET)}] " + " ".join(partes) +
+                         f"  | Prec: {self.cor(COR_VERDE)}{jogo.precisao:.1f}%{self.cor(COR_RESET)}") 
+
+    def elite(self, jogos: List[JogoGerado], proximo: int, analytics: Mapping[int, DezenaAnalytics]):
+        reset = self.cor(COR_RESET)
+        self.linha("◆")
+        self.linha_texto(f"{self.cor(COR_AMARELO, COR_NEGRITO)}  >>> ELITE NEURAL SCANNER: CONCURSO {proximo}{reset}")
+        self.linha("◆") 
+
+        for rank, jogo in enumerate(jogos[:3], 1):
+            icone = "🔥🔥🔥 ULTRA" if jogo.precisao > 90 else "🔥🔥 PREMIUM" if jogo.precisao > 80 else "🔥 HOT" if jogo.precisao > 70 else "⭐ STD"
+            cor = COR_VERMELHO if jogo.precisao > 90 else COR_VERDE if jogo.precisao > 80 else COR_AMARELO 
+
+            self.linha_texto(f"\n  {self.cor(cor, COR_NEGRITO)}[RANK {rank}] JOGO {jogo.letra} ({jogo.precisao:.2f}% {icone}){reset}")
+            self.linha_texto(f"  {'─' * 50}") 
+
+            for i, d in enumerate(jogo.dezenas):
+                a = analytics.get(d)
+                info = f"    Bola {i+1}: {self.dezena(d, jogo.status_detalhado[i])}"
+                if a:
+                    info += f" | Atraso: {a.atraso_atual} | Prob: {a.probabilidade_saida:.1f}%"
+                self.linha_texto(info) 
+
+    def mestre(self, jogo: JogoGerado):
+        reset = self.cor(COR_RESET)
+        self.linha("█")
+        self.linha_texto(f"{self.cor(COR_VERMELHO, COR_NEGRITO)}  >>> JOGO H (CONVERGÊNCIA MESTRA NEURAL){reset}")
+        self.linha("█")
+        dezenas_fmt = "  ".join(f"{self.cor(COR_VERDE)}{d:02d}(+){reset}" for d in jogo.dezenas)
+        self.linha_texto(f"\n  [{dezenas_fmt}]")
+        self.linha_texto(f"\n  {self.cor(COR_AMARELO)}Precisão Neural: {jogo.precisao:.2f}%{reset}")
+        self.linha("█") 
+
+    def relatorio(self, rel: RelatorioScan):
+        self.limpar()
+        self.cabecalho(" MOTOR Z9 ULTRA v10.2 | SISTEMA NEURAL DE ALTA PERFORMANCE ")
+        self.linha_texto(f"{self.cor(COR_CIANO)}  Base: {rel.concursos} concursos | Próximo: {rel.proximo}{self.cor(COR_RESET)}")
+        self.linha() 
+
+        estrutura = ' '.join([f"{i+1}ª[{inc.raiz_dominante}]({inc.tendencia})" for i, inc in enumerate(rel.inercias)])
+        self.linha_texto(f"  [ESTRUTURA RAIZ]: {self.cor(COR_AMARELO)}{estrutura}{self.cor(COR_RESET)}")
+        self.linha() 
+
+        for jogo in rel.jogos:
+            self.jogo(jogo) 
+
+        self.elite(rel.jogos, rel.proximo, rel.analytics) 
+
+        if rel.mestre is not None:
+            self.mestre(rel.mestre)
+            self.linha_texto(f"\n{self.cor(COR_VERDE)}Análise concluída com sucesso!{self.cor(COR_RESET)}") 
+
+    def status(self, texto: str, *cores: str):
+        """Linha de andamento (carregamento, progresso), escrita na hora"""
+        self.linha_texto(f"{self.cor(*cores)}{texto}{self.cor(COR_RESET) if cores else ''}")
+        self.escrever() 
+
+    def perguntar(self, texto: str, *cores: str) -> str:
+        self.escrever()
+        return input(f"{self.cor(*cores)}{texto}{self.cor(COR_RESET) if cores else ''}") 
+
+    def conteudo(self) -> str:
+        return ''.join(self.partes) 
+
+    def escrever(self, saida=None):
+        """Esvazia o buffer em uma única escrita"""
+        saida = saida or sys.stdout
+        saida.write(self.conteudo())
+        saida.flush()
+        self.partes.clear() 
+
+class RenderizadorJSON:
+    """
+    Mesmo relatório como um objeto JSON (uma linha), para outros programas. O
+    stdout leva só os relatórios; andamento e perguntas vão para o stderr
+    """
+    cores = False 
+
+    def __init__(self):
+        self.partes: List[str] = [] 
+
+    def cor(self, *codigos: str) -> str:
+        return '' 
+
+    def limpar(self):
+        pass 
+
+    def cabecalho(self, titulo: str):
+        pass 
+
+    def status(self, texto: str, *cores: str):
+        sys.stderr.write(texto + '\n')
+        sys.stderr.flush() 
+
+    def perguntar(self, texto: str, *cores: str) -> str:
+        sys.stderr.write(texto)
+        sys.stderr.flush()
+        return input() 
+
+    @staticmethod
+    def _jogo(jogo: JogoGerado) -> Dict:
+        return {
+            'letra': jogo.letra, 'dezenas': jogo.dezenas, 'raizes': jogo.raizes,
+            'status': jogo.status_detalhado, 'precisao': round(jogo.precisao, 4),
+            'mc_score': round(jogo.mc_score, 6), 'mc_convergencia': round(jogo.mc_convergencia, 6),
+            'mc_variancia': round(jogo.mc_variancia, 6), 'dna': jogo.dna
+        } 
+
+    def relatorio(self, rel: RelatorioScan):
+        elite = []
+        for jogo in rel.jogos[:3]:
+            bolas = []
+            for d in jogo.dezenas:
+                a = rel.analytics.get(d)
+                bolas.append({'dezena': d, 'atraso': a.atraso_atual if a else None,
+                              'probabilidade': round(a.probabilidade_saida, 4) if a else None})
+            elite.append({'letra': jogo.letra, 'bolas': bolas})
+        objeto = {
+            'concursos': rel.concursos,
+            'proximo': rel.proximo,
+            'estrutura': [{'posicao': inc.posicao, 'raiz': inc.raiz_dominante, 'tendencia': inc.tendencia,
+                           'forca': round(inc.forca, 6), 'confianca': round(inc.confianca, 6)}
+                          for inc in rel.inercias],
+            'jogos': [self._jogo(j) for j in rel.jogos],
+            'elite': elite,
+            'mestre': self._jogo(rel.mestre) if rel.mestre is not None else None
+        }
+        self.partes.append(json.dumps(objeto, ensure_ascii=False) + '\n') 
+
+    def conteudo(self) -> str:
+        return ''.join(self.partes) 
+
+    def escrever(self, saida=None):
+        saida = saida or sys.stdout
+        saida.write(self.conteudo())
+        saida.flush()
+        self.partes.clear() 
+
+def criar_renderizador(formato: Optional[str] = None):
+    """'ansi', 'texto' ou 'json'; sem formato usa a variável Z9_RENDER"""
+    formato = (formato or os.environ.get(ENV_RENDER) or 'ansi').lower()
+    if formato == 'json':
+        return RenderizadorJSON()
+    if formato in ('texto', 'plain'):
+        return RenderizadorTerminal(cores=False)
+    if formato == 'ansi':
+        return RenderizadorTerminal()
+    raise ValueError(f"formato de renderização desconhecido: {formato!r}") 
+
+# Funções avulsas (compatibilidade): cada uma escreve seu trecho de uma vez 
 
-    analisador = AnalisadorInercia(motor)
-    inercias = analisador.analisar() 
+def limpar_tela():
+    sys.stdout.write(LIMPAR_TELA)
+    sys.stdout.flush() 
 
-    classificador = ClassificadorTermico(motor)
-    precisao = MotorPrecisao(motor, classificador) 
+def print_header(titulo: str):
+    r = RenderizadorTerminal()
+    r.cabecalho(titulo)
+    r.escrever() 
 
-    gerador = GeradorJogos(motor, inercias, classificador, precisao)
-    jogos = gerador.gerar(7) 
+def print_linha(char: str = "═"):
+    r = RenderizadorTerminal()
+    r.linha(char)
+    r.escrever() 
 
-    limpar_tela()
-    print_header(" MOTOR Z9 ULTRA v10.2 | SISTEMA NEURAL DE ALTA PERFORMANCE ")
-    print(f"{COR_CIANO}  Base: {total} concursos | Próximo: {total + 1}{COR_RESET}")
-    print_linha() 
+def formatar_dezena(dezena: int, status: str) -> str:
+    return RenderizadorTerminal().dezena(dezena, status) 
 
-    estrutura = ' '.join([f"{i+1}ª[{inc.raiz_dominante}]({inc.tendencia})" for i, inc in enumerate(inercias)])
-    print(f"  [ESTRUTURA RAIZ]: {COR_AMARELO}{estrutura}{COR_RESET}")
-    print_linha() 
+def print_jogo(jogo: JogoGerado, inercias: List[PosicaoRaiz]):
+    r = RenderizadorTerminal()
+    r.jogo(jogo)
+    r.escrever() 
 
-    for jogo in jogos:
-        print_jogo(jogo, inercias) 
+def print_elite(jogos: List[JogoGerado], inercias: List[PosicaoRaiz], proximo: int,
+                analytics: Optional[Mapping[int, DezenaAnalytics]] = None):
+    """`analytics` vem do motor já processado (motor.analytics); sem ele as bolas saem sem atraso/prob"""
+    r = RenderizadorTerminal()
+    r.elite(jogos, proximo, analytics or {})
+    r.escrever() 
 
-    print_elite(jogos, inercias, total + 1) 
+def print_mestre(jogo: JogoGerado):
+    r = RenderizadorTerminal()
+    r.mestre(jogo)
+    r.escrever() 
 
-    mestre = gerador.gerar_mestre()
-    print_mestre(mestre) 
+# ================================================================================
+# FUNÇÃO PRINCIPAL (INTACTA)
+# ================================================================================ 
 
-    print(f"\n{COR_VERDE}Análise concluída com sucesso!{COR_RESET}") 
+def painel_principal(perfil: Optional[str] = None, sessao: Optional[SessaoMotor] = None,
+                     renderizador=None):
+    """
+    Um scan completo. Com `sessao` o estado carregado é reaproveitado entre
+    chamadas. Com `perfil` (ou a variável Z9_PERFIL) anexa ao arquivo uma linha
+    JSON com tempos por etapa e contadores do scan. Toda a saída passa por
+    `renderizador` (padrão: criar_renderizador(), que lê Z9_RENDER)
+    """
+    perfil = perfil or os.environ.get(ENV_PERFIL)
+    renderizador = renderizador or criar_renderizador()
+    perfilador = None
+    if perfil:
+        PERFIL.reiniciar()
+        PERFIL.ativo = True
+        texto = os.environ.get(ENV_PERFIL_CPROFILE) or '0'
+        try:
+            funcoes_cprofile = int(texto)
+        except ValueError:
+            renderizador.status(f"AVISO: {ENV_PERFIL_CPROFILE}={texto!r} não é inteiro; cProfile desligado",
+                                COR_AMARELO)
+            funcoes_cprofile = 0
+        if funcoes_cprofile > 0:
+            import cProfile
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+    inicio = time.perf_counter()
+    try:
+        _executar_scan(sessao or SessaoMotor(), renderizador)
+    finally:
+        if perfil:
+            PERFIL.ativo = False
+            extras = {'data': datetime.now().isoformat(timespec='seconds'),
+                      'segundos': round(time.perf_counter() - inicio, 6)}
+            if perfilador:
+                perfilador.disable()
+                extras['cprofile'] = resumo_cprofile(perfilador, funcoes_cprofile)
+            with open(perfil, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(PERFIL.relatorio(**extras), ensure_ascii=False) + '\n') 
+
+def _executar_scan(sessao: SessaoMotor, renderizador):
+    carregando = not sessao.valida()
+    if carregando:
+        renderizador.status("Carregando dados...", COR_CIANO)
+    if not sessao.preparar(verboso=False, valido=not carregando):
+        renderizador.status(f"ERRO: {sessao.erro}", COR_VERMELHO)
+        renderizador.perguntar("\nPressione ENTER para sair...")
+        return 
+
+    motor = sessao.motor
+    if carregando and motor.total_rejeitadas:
+        amostra = ', '.join(str(linha) for linha, _ in motor.linhas_rejeitadas[:10])
+        renderizador.status(f"AVISO: {motor.total_rejeitadas} linha(s) recusada(s) em "
+                            f"{sessao.arquivo} (linhas {amostra})", COR_AMARELO) 
+
+    inercias = sessao.inercias
+    total = len(motor.historico)
+    PERFIL.contar('concursos', total)
+    renderizador.status(f"✓ {total} concursos carregados\n", COR_VERDE) 
+
+    with PERFIL.etapa('geracao'):
+        gerador = sessao.gerador()
+        for evento in gerador.gerar_fluxo(7):
+            if isinstance(evento, ResumoGeracao):
+                jogos = evento.ranking
+            else:
+                renderizador.status(f"  ✓ Jogo {evento.letra} refinado ({evento.precisao:.2f}%)", COR_CIANO) 
+
+    with PERFIL.etapa('mestre'):
+        mestre = gerador.gerar_mestre() 
+
+    # Relatório montado em um buffer a partir do estado do scan e escrito de uma vez
+    with PERFIL.etapa('renderizacao'):
+        renderizador.relatorio(RelatorioScan(total, inercias, jogos, mestre, motor.analytics))
+        renderizador.escrever() 
 
 def main():
-    limpar_tela()
-    print_header(" ESCRITÓRIO Z9 - SCANNER NEURAL ULTRA (v10.2) ") 
+    # Tela, banner, perguntas e avisos seguem o formato de Z9_RENDER (json: stdout só com relatórios)
+    renderizador = criar_renderizador()
+    renderizador.limpar()
+    renderizador.cabecalho(" ESCRITÓRIO Z9 - SCANNER NEURAL ULTRA (v10.2) ") 
+
+    chave = renderizador.perguntar("\nDIGITE A KEY: ", COR_AMARELO).strip() 
 
-    chave = input(f"\n{COR_AMARELO}DIGITE A KEY: {COR_RESET}").strip() 
+    if chave != CHAVE_MESTRA:
+        renderizador.status("\nACESSO NEGADO.", COR_VERMELHO, COR_NEGRITO)
+        time.sleep(2)
+        return 
 
-    if chave != CHAVE_MESTRA:
-        print(f"\n{COR_VERMELHO}{COR_NEGRITO}ACESSO NEGADO.{COR_RESET}")
-        time.sleep(2)
-        return 
+    # Estado quente entre scans: só recarrega se o arquivo de dados mudar
+    sessao = SessaoMotor() 
 
-    while True:
-        limpar_tela()
-        painel_principal() 
+    while True:
+        renderizador.limpar()
+        painel_principal(sessao=sessao, renderizador=renderizador) 
 
-        opcao = input(f"\n{COR_CIANO}>>> ENTER para novo scan ou 'SAIR': {COR_RESET}").lower().strip()
-        if opcao == 'sair':
-            break 
+        opcao = renderizador.perguntar("\n>>> ENTER para novo scan ou 'SAIR': ", COR_CIANO).lower().strip()
+        if opcao == 'sair':
+            break 
 
-    limpar_tela()    print(f"{COR_VERDE}Sistema encerrado. Boa sorte!{COR_RESET}") 
+    renderizador.limpar()
+    renderizador.status("Sistema encerrado. Boa sorte!", COR_VERDE) 
 
 if __name__ == "__main__":
-    main()
+    # Com argumentos roda em lote (agendadores, pipelines); sem argumentos, o painel interativo
+    if len(sys.argv) > 1:
+        sys.exit(main_lote())
+    main()